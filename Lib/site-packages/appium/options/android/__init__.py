@@ -1,2 +1,27 @@
-from .espresso.base import EspressoOptions
-from .uiautomator2.base import UiAutomator2Options
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .espresso.base import EspressoOptions
+    from .uiautomator2.base import UiAutomator2Options
+
+__all__ = ['EspressoOptions', 'UiAutomator2Options']
+
+# Each options class mixes in dozens of single-capability modules, so only
+# the driver that is actually used gets imported (PEP 562)
+_LAZY_IMPORTS = {
+    'EspressoOptions': '.espresso.base',
+    'UiAutomator2Options': '.uiautomator2.base',
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
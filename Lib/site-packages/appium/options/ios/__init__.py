@@ -1,2 +1,27 @@
-from .safari.base import SafariOptions
-from .xcuitest.base import XCUITestOptions
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .safari.base import SafariOptions
+    from .xcuitest.base import XCUITestOptions
+
+__all__ = ['SafariOptions', 'XCUITestOptions']
+
+# Each options class mixes in dozens of single-capability modules, so only
+# the driver that is actually used gets imported (PEP 562)
+_LAZY_IMPORTS = {
+    'SafariOptions': '.safari.base',
+    'XCUITestOptions': '.xcuitest.base',
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -15,34 +15,38 @@
 # specific language governing permissions and limitations
 # under the License.
 
-from .chrome.options import Options as ChromeOptions  # noqa
-from .chrome.service import Service as ChromeService  # noqa
-from .chrome.webdriver import WebDriver as Chrome  # noqa
-from .common.action_chains import ActionChains  # noqa
-from .common.desired_capabilities import DesiredCapabilities  # noqa
-from .common.keys import Keys  # noqa
-from .common.proxy import Proxy  # noqa
-from .edge.options import Options as EdgeOptions  # noqa
-from .edge.service import Service as EdgeService  # noqa
-from .edge.webdriver import WebDriver as ChromiumEdge  # noqa
-from .edge.webdriver import WebDriver as Edge  # noqa
-from .firefox.firefox_profile import FirefoxProfile  # noqa
-from .firefox.options import Options as FirefoxOptions  # noqa
-from .firefox.service import Service as FirefoxService  # noqa
-from .firefox.webdriver import WebDriver as Firefox  # noqa
-from .ie.options import Options as IeOptions  # noqa
-from .ie.service import Service as IeService  # noqa
-from .ie.webdriver import WebDriver as Ie  # noqa
-from .remote.webdriver import WebDriver as Remote  # noqa
-from .safari.options import Options as SafariOptions
-from .safari.service import Service as SafariService  # noqa
-from .safari.webdriver import WebDriver as Safari  # noqa
-from .webkitgtk.options import Options as WebKitGTKOptions  # noqa
-from .webkitgtk.service import Service as WebKitGTKService  # noqa
-from .webkitgtk.webdriver import WebDriver as WebKitGTK  # noqa
-from .wpewebkit.options import Options as WPEWebKitOptions  # noqa
-from .wpewebkit.service import Service as WPEWebKitService  # noqa
-from .wpewebkit.webdriver import WebDriver as WPEWebKit  # noqa
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .chrome.options import Options as ChromeOptions  # noqa
+    from .chrome.service import Service as ChromeService  # noqa
+    from .chrome.webdriver import WebDriver as Chrome  # noqa
+    from .common.action_chains import ActionChains  # noqa
+    from .common.desired_capabilities import DesiredCapabilities  # noqa
+    from .common.keys import Keys  # noqa
+    from .common.proxy import Proxy  # noqa
+    from .edge.options import Options as EdgeOptions  # noqa
+    from .edge.service import Service as EdgeService  # noqa
+    from .edge.webdriver import WebDriver as ChromiumEdge  # noqa
+    from .edge.webdriver import WebDriver as Edge  # noqa
+    from .firefox.firefox_profile import FirefoxProfile  # noqa
+    from .firefox.options import Options as FirefoxOptions  # noqa
+    from .firefox.service import Service as FirefoxService  # noqa
+    from .firefox.webdriver import WebDriver as Firefox  # noqa
+    from .ie.options import Options as IeOptions  # noqa
+    from .ie.service import Service as IeService  # noqa
+    from .ie.webdriver import WebDriver as Ie  # noqa
+    from .remote.webdriver import WebDriver as Remote  # noqa
+    from .safari.options import Options as SafariOptions  # noqa
+    from .safari.service import Service as SafariService  # noqa
+    from .safari.webdriver import WebDriver as Safari  # noqa
+    from .webkitgtk.options import Options as WebKitGTKOptions  # noqa
+    from .webkitgtk.service import Service as WebKitGTKService  # noqa
+    from .webkitgtk.webdriver import WebDriver as WebKitGTK  # noqa
+    from .wpewebkit.options import Options as WPEWebKitOptions  # noqa
+    from .wpewebkit.service import Service as WPEWebKitService  # noqa
+    from .wpewebkit.webdriver import WebDriver as WPEWebKit  # noqa
 
 __version__ = "4.28.1"
 
@@ -77,3 +81,52 @@ __all__ = [
     "Proxy",
     "Keys",
 ]
+
+# Public names and the submodule attribute each one refers to. They are imported
+# on first access (PEP 562), so `from selenium import webdriver` no longer loads
+# every browser's driver, options and service modules up front.
+_LAZY_IMPORTS = {
+    "ChromeOptions": (".chrome.options", "Options"),
+    "ChromeService": (".chrome.service", "Service"),
+    "Chrome": (".chrome.webdriver", "WebDriver"),
+    "ActionChains": (".common.action_chains", "ActionChains"),
+    "DesiredCapabilities": (".common.desired_capabilities", "DesiredCapabilities"),
+    "Keys": (".common.keys", "Keys"),
+    "Proxy": (".common.proxy", "Proxy"),
+    "EdgeOptions": (".edge.options", "Options"),
+    "EdgeService": (".edge.service", "Service"),
+    "ChromiumEdge": (".edge.webdriver", "WebDriver"),
+    "Edge": (".edge.webdriver", "WebDriver"),
+    "FirefoxProfile": (".firefox.firefox_profile", "FirefoxProfile"),
+    "FirefoxOptions": (".firefox.options", "Options"),
+    "FirefoxService": (".firefox.service", "Service"),
+    "Firefox": (".firefox.webdriver", "WebDriver"),
+    "IeOptions": (".ie.options", "Options"),
+    "IeService": (".ie.service", "Service"),
+    "Ie": (".ie.webdriver", "WebDriver"),
+    "Remote": (".remote.webdriver", "WebDriver"),
+    "SafariOptions": (".safari.options", "Options"),
+    "SafariService": (".safari.service", "Service"),
+    "Safari": (".safari.webdriver", "WebDriver"),
+    "WebKitGTKOptions": (".webkitgtk.options", "Options"),
+    "WebKitGTKService": (".webkitgtk.service", "Service"),
+    "WebKitGTK": (".webkitgtk.webdriver", "WebDriver"),
+    "WPEWebKitOptions": (".wpewebkit.options", "Options"),
+    "WPEWebKitService": (".wpewebkit.service", "Service"),
+    "WPEWebKit": (".wpewebkit.webdriver", "WebDriver"),
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attribute = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name, __name__), attribute)
+    # Cache it on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
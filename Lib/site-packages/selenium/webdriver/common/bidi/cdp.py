@@ -45,6 +45,12 @@ import trio
 from trio_websocket import ConnectionClosed as WsConnectionClosed
 from trio_websocket import connect_websocket_url
 
+from selenium.webdriver.remote.event_dispatcher import BLOCK
+from selenium.webdriver.remote.event_dispatcher import COALESCE
+from selenium.webdriver.remote.event_dispatcher import DROP
+from selenium.webdriver.remote.event_dispatcher import EventCounters
+from selenium.webdriver.remote.event_dispatcher import validate_policy
+
 logger = logging.getLogger("trio_cdp")
 T = TypeVar("T")
 MAX_WS_MESSAGE_SIZE = 2**24
@@ -198,6 +204,11 @@ class CdpBase:
         self.session_id = session_id
         self.target_id = target_id
         self.channels = defaultdict(set)
+        # sender -> (overflow policy, receiver clone used to discard the oldest event when coalescing)
+        self.channel_policies = {}
+        # event class -> CDP method name, to count coalesced events under the name they arrived with
+        self.event_names = {}
+        self.event_counters = EventCounters()
         self.id_iter = itertools.count()
         self.inflight_cmd = {}
         self.inflight_result = {}
@@ -232,16 +243,34 @@ class CdpBase:
             raise response
         return response
 
-    def listen(self, *event_types, buffer_size=10):
-        """Return an async iterator that iterates over events matching the
-        indicated types."""
+    def _open_channel(self, buffer_size, policy):
+        if validate_policy(policy) == COALESCE and buffer_size < 1:
+            # With no buffer there is no oldest event to discard, so coalescing could never make room
+            raise ValueError("buffer_size must be at least 1 for the coalesce policy")
         sender, receiver = trio.open_memory_channel(buffer_size)
+        self.channel_policies[sender] = (validate_policy(policy), receiver.clone() if policy == COALESCE else None)
+        return sender, receiver
+
+    def listen(self, *event_types, buffer_size=10, policy=DROP):
+        """Return an async iterator that iterates over events matching the
+        indicated types.
+
+        :param buffer_size: events held for the iterator before ``policy`` applies
+        :param policy: what to do with an event when the buffer is full:
+            ``"drop"`` discards it, ``"coalesce"`` discards the oldest
+            buffered event instead and ``"block"`` makes the reader wait
+            for room, pausing every other listener on this connection.
+            Discarded and delayed events are counted in ``event_counters``;
+            an event counts as delivered once it is handed to the iterator
+            and is moved to coalesced if it is later discarded unread.
+        """
+        sender, receiver = self._open_channel(buffer_size, policy)
         for event_type in event_types:
             self.channels[event_type].add(sender)
         return receiver
 
     @asynccontextmanager
-    async def wait_for(self, event_type: Type[T], buffer_size=10) -> AsyncGenerator[CmEventProxy, None]:
+    async def wait_for(self, event_type: Type[T], buffer_size=10, policy=DROP) -> AsyncGenerator[CmEventProxy, None]:
         """Wait for an event of the given type and return it.
 
         This is an async context manager, so you should open it inside
@@ -250,7 +279,7 @@ class CdpBase:
         """
         sender: trio.MemorySendChannel
         receiver: trio.MemoryReceiveChannel
-        sender, receiver = trio.open_memory_channel(buffer_size)
+        sender, receiver = self._open_channel(buffer_size, policy)
         self.channels[event_type].add(sender)
         proxy = CmEventProxy()
         yield proxy
@@ -266,7 +295,7 @@ class CdpBase:
         if "id" in data:
             self._handle_cmd_response(data)
         else:
-            self._handle_event(data)
+            return self._handle_event(data)
 
     def _handle_cmd_response(self, data):
         """Handle a response to a command. This will set an event flag that
@@ -299,20 +328,66 @@ class CdpBase:
         """Handle an event.
 
         :param dict data: event as a JSON dictionary
+        :returns: ``(sender, event_name, event)`` for each full ``"block"``
+            channel, which the reader task must await before reading on
         """
         global devtools
         event = devtools.util.parse_json_event(data)
         logger.debug("Received event: %s", event)
+        event_name = data.get("method", type(event).__name__)
+        self.event_names[type(event)] = event_name
         to_remove = set()
+        blocked = []
         for sender in self.channels[type(event)]:
+            policy, drain = self.channel_policies.get(sender, (DROP, None))
+            if drain is not None and sender.statistics().open_receive_channels <= 1:
+                # Only our own clone is left, so the listener has gone away
+                to_remove.add(sender)
+                continue
             try:
                 sender.send_nowait(event)
+                self.event_counters.add(event_name, "delivered")
             except trio.WouldBlock:
-                logger.error('Unable to send event "%r" due to full channel %s', event, sender)
+                if policy == BLOCK:
+                    self.event_counters.add(event_name, "blocked")
+                    blocked.append((sender, event_name, event))
+                elif policy == COALESCE:
+                    # The discarded event was counted as delivered when it was queued
+                    discarded = drain.receive_nowait()
+                    discarded_name = self.event_names.get(type(discarded), type(discarded).__name__)
+                    self.event_counters.add(discarded_name, "delivered", -1)
+                    self.event_counters.add(discarded_name, "coalesced")
+                    sender.send_nowait(event)
+                    self.event_counters.add(event_name, "delivered")
+                else:
+                    self.event_counters.add(event_name, "dropped")
+                    logger.error('Unable to send event "%r" due to full channel %s', event, sender)
             except trio.BrokenResourceError:
                 to_remove.add(sender)
         if to_remove:
             self.channels[type(event)] -= to_remove
+            for sender in to_remove:
+                self._forget_channel(sender)
+        return blocked
+
+    async def _send_blocked(self, blocked):
+        """Deliver events held back by full ``"block"`` channels, waiting for
+        their listeners to make room."""
+        for sender, event_name, event in blocked or ():
+            try:
+                await sender.send(event)
+                self.event_counters.add(event_name, "delivered")
+            except trio.BrokenResourceError:
+                for senders in self.channels.values():
+                    senders.discard(sender)
+                self._forget_channel(sender)
+
+    def _forget_channel(self, sender):
+        if any(sender in senders for senders in self.channels.values()):
+            return
+        _, drain = self.channel_policies.pop(sender, (DROP, None))
+        if drain is not None:
+            drain.close()
 
 
 class CdpSession(CdpBase):
@@ -462,9 +537,9 @@ class CdpConnection(CdpBase, trio.abc.AsyncResource):
                             "data": f"{session_id!r}",
                         }
                     )
-                session._handle_data(data)
+                await session._send_blocked(session._handle_data(data))
             else:
-                self._handle_data(data)
+                await self._send_blocked(self._handle_data(data))
 
         for _, session in self.sessions.items():
             for _, senders in session.channels.items():
@@ -0,0 +1,58 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""On-demand loading of CDP domain modules for every devtools version.
+
+Each ``vNNN`` package lists its domains in ``DOMAINS`` and only imports a
+domain module when it is first used, either as an attribute
+(``devtools.network``) or when an event of that domain has to be parsed.
+"""
+
+from importlib import import_module
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Tuple
+
+
+def load_domain(package: str, domain: str) -> Any:
+    """Import and return the module for a CDP domain name such as
+    ``"Network"`` or ``"DOMDebugger"``.
+
+    :raises KeyError: if the version has no such domain
+    """
+    version = import_module(package)
+    return getattr(version, version.DOMAINS[domain])
+
+
+def lazy_module_attributes(
+    package: str, domains: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Return the ``__getattr__`` and ``__dir__`` (PEP 562) for a devtools
+    version package."""
+    modules = set(domains.values()) | {"util"}
+
+    def __getattr__(name: str) -> Any:
+        if name not in modules:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        # Importing a submodule also binds it on the package, so this runs once per domain
+        return import_module(f"{package}.{name}")
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(import_module(package))) | modules)
+
+    return __getattr__, __dir__
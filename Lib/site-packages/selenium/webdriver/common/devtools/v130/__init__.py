@@ -2,59 +2,67 @@
 #
 # This file is generated from the CDP specification. If you need to make
 # changes, edit the generator and regenerate all of the modules.
-from . import accessibility
-from . import animation
-from . import audits
-from . import autofill
-from . import background_service
-from . import bluetooth_emulation
-from . import browser
-from . import css
-from . import cache_storage
-from . import cast
-from . import console
-from . import dom
-from . import dom_debugger
-from . import dom_snapshot
-from . import dom_storage
-from . import database
-from . import debugger
-from . import device_access
-from . import device_orientation
-from . import emulation
-from . import event_breakpoints
-from . import extensions
-from . import fed_cm
-from . import fetch
-from . import file_system
-from . import headless_experimental
-from . import heap_profiler
-from . import io
-from . import indexed_db
-from . import input_
-from . import inspector
-from . import layer_tree
-from . import log
-from . import media
-from . import memory
-from . import network
-from . import overlay
-from . import pwa
-from . import page
-from . import performance
-from . import performance_timeline
-from . import preload
-from . import profiler
-from . import runtime
-from . import schema
-from . import security
-from . import service_worker
-from . import storage
-from . import system_info
-from . import target
-from . import tethering
-from . import tracing
-from . import web_audio
-from . import web_authn
-from . import util
+#
+# Domain modules are imported on first use rather than all at once, see
+# selenium.webdriver.common.devtools.lazy_domains.
+from ..lazy_domains import lazy_module_attributes
+
+# CDP domain name -> module in this package
+DOMAINS = {
+    "Accessibility": "accessibility",
+    "Animation": "animation",
+    "Audits": "audits",
+    "Autofill": "autofill",
+    "BackgroundService": "background_service",
+    "BluetoothEmulation": "bluetooth_emulation",
+    "Browser": "browser",
+    "CacheStorage": "cache_storage",
+    "Cast": "cast",
+    "Console": "console",
+    "CSS": "css",
+    "Database": "database",
+    "Debugger": "debugger",
+    "DeviceAccess": "device_access",
+    "DeviceOrientation": "device_orientation",
+    "DOM": "dom",
+    "DOMDebugger": "dom_debugger",
+    "DOMSnapshot": "dom_snapshot",
+    "DOMStorage": "dom_storage",
+    "Emulation": "emulation",
+    "EventBreakpoints": "event_breakpoints",
+    "Extensions": "extensions",
+    "FedCm": "fed_cm",
+    "Fetch": "fetch",
+    "FileSystem": "file_system",
+    "HeadlessExperimental": "headless_experimental",
+    "HeapProfiler": "heap_profiler",
+    "IndexedDB": "indexed_db",
+    "Input": "input_",
+    "Inspector": "inspector",
+    "IO": "io",
+    "LayerTree": "layer_tree",
+    "Log": "log",
+    "Media": "media",
+    "Memory": "memory",
+    "Network": "network",
+    "Overlay": "overlay",
+    "Page": "page",
+    "Performance": "performance",
+    "PerformanceTimeline": "performance_timeline",
+    "Preload": "preload",
+    "Profiler": "profiler",
+    "PWA": "pwa",
+    "Runtime": "runtime",
+    "Schema": "schema",
+    "Security": "security",
+    "ServiceWorker": "service_worker",
+    "Storage": "storage",
+    "SystemInfo": "system_info",
+    "Target": "target",
+    "Tethering": "tethering",
+    "Tracing": "tracing",
+    "WebAudio": "web_audio",
+    "WebAuthn": "web_authn",
+}
 
+__getattr__, __dir__ = lazy_module_attributes(__name__, DOMAINS)
@@ -1,6 +1,8 @@
 
 import typing
 
+from ..lazy_domains import load_domain
+
 
 T_JSON_DICT = typing.Dict[str, typing.Any]
 _event_parsers = dict()
@@ -17,4 +19,8 @@ def event_class(method):
 
 def parse_json_event(json: T_JSON_DICT) -> typing.Any:
     ''' Parse a JSON dictionary into a CDP event. '''
-    return _event_parsers[json['method']].from_json(json['params'])
+    method = json['method']
+    if method not in _event_parsers:
+        # Event classes register themselves when their domain module is imported
+        load_domain(__package__, method.split('.')[0])
+    return _event_parsers[method].from_json(json['params'])
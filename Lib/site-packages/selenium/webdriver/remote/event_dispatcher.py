@@ -0,0 +1,210 @@
+# Licensed to the Software Freedom Conservancy (SFC) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The SFC licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Bounded delivery of CDP/BiDi events to listeners.
+
+Events are queued per listener and delivered off the socket thread, so a
+slow callback delays only its own events. What happens when a listener's
+queue is full is decided by its overflow policy:
+
+- ``DROP``: the new event is discarded.
+- ``COALESCE``: the oldest queued event is discarded to make room, so the
+  listener always sees the most recent events.
+- ``BLOCK``: the producer waits for room. This applies backpressure to the
+  socket reader and should only be used for listeners that must not lose
+  events.
+
+Every discarded or delayed event is counted in :class:`EventCounters`.
+"""
+
+import logging
+from collections import Counter
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition
+from threading import Lock
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Hashable
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DROP = "drop"
+COALESCE = "coalesce"
+BLOCK = "block"
+POLICIES = (DROP, COALESCE, BLOCK)
+
+DEFAULT_BUFFER_SIZE = 1000
+DEFAULT_WORKERS = 4
+
+
+def validate_policy(policy: str) -> str:
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown event overflow policy {policy!r}, expected one of {POLICIES}")
+    return policy
+
+
+class EventCounters:
+    """Thread-safe per-event counts of delivered, dropped, coalesced,
+    blocked and failed events."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counts: Dict[str, Counter] = {}
+
+    def add(self, event_name: str, outcome: str, count: int = 1) -> None:
+        with self._lock:
+            self._counts.setdefault(event_name, Counter())[outcome] += count
+
+    def get(self, event_name: str, outcome: str) -> int:
+        with self._lock:
+            return self._counts.get(event_name, Counter())[outcome]
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Return a copy of the counts as ``{event_name: {outcome: count}}``."""
+        with self._lock:
+            return {name: dict(counts) for name, counts in self._counts.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+class _Subscription:
+    def __init__(self, callback: Callable[[Any], None], buffer_size: int, policy: str):
+        self.callback = callback
+        self.buffer_size = buffer_size
+        self.policy = policy
+        self.queue: deque = deque()
+        self.condition = Condition()
+        self.scheduled = False
+        self.closed = False
+
+
+class EventDispatcher:
+    """Delivers events to callbacks on a worker pool, through one bounded
+    queue per callback.
+
+    Events for the same callback are delivered in order, one at a time.
+
+    :param buffer_size: events queued per callback before the policy applies
+    :param policy: overflow policy, one of ``DROP``, ``COALESCE`` or ``BLOCK``
+    :param workers: threads shared by all callbacks of this dispatcher
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE, policy: str = DROP, workers: int = DEFAULT_WORKERS):
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+        self.buffer_size = buffer_size
+        self.policy = validate_policy(policy)
+        self.counters = EventCounters()
+        self._workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._subscriptions: Dict[Hashable, _Subscription] = {}
+        self._lock = Lock()
+
+    def subscribe(
+        self,
+        key: Hashable,
+        callback: Callable[[Any], None],
+        buffer_size: Optional[int] = None,
+        policy: Optional[str] = None,
+    ) -> None:
+        """Register ``callback`` under ``key``, optionally overriding the
+        dispatcher's buffer size and policy for it."""
+        subscription = _Subscription(
+            callback, buffer_size or self.buffer_size, validate_policy(policy) if policy else self.policy
+        )
+        with self._lock:
+            self._subscriptions[key] = subscription
+
+    def unsubscribe(self, key: Hashable) -> None:
+        """Stop delivering to the callback registered under ``key``; queued
+        events for it are discarded."""
+        with self._lock:
+            subscription = self._subscriptions.pop(key, None)
+        if subscription:
+            with subscription.condition:
+                subscription.closed = True
+                subscription.queue.clear()
+                subscription.condition.notify_all()
+
+    def dispatch(self, key: Hashable, event_name: str, params: Any) -> None:
+        """Queue ``params`` for the callback registered under ``key``."""
+        with self._lock:
+            subscription = self._subscriptions.get(key)
+        if subscription is None:
+            return
+
+        with subscription.condition:
+            if len(subscription.queue) >= subscription.buffer_size:
+                if subscription.policy == DROP:
+                    self.counters.add(event_name, "dropped")
+                    logger.debug("Dropped %s event, listener queue is full", event_name)
+                    return
+                if subscription.policy == COALESCE:
+                    subscription.queue.popleft()
+                    self.counters.add(event_name, "coalesced")
+                else:
+                    self.counters.add(event_name, "blocked")
+                    subscription.condition.wait_for(
+                        lambda: subscription.closed or len(subscription.queue) < subscription.buffer_size
+                    )
+            if subscription.closed:
+                return
+            subscription.queue.append((event_name, params))
+            if subscription.scheduled:
+                return
+            subscription.scheduled = True
+        self._get_executor().submit(self._drain, subscription)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="selenium-events")
+            return self._executor
+
+    def _drain(self, subscription: _Subscription) -> None:
+        while True:
+            with subscription.condition:
+                if not subscription.queue:
+                    subscription.scheduled = False
+                    return
+                event_name, params = subscription.queue.popleft()
+                subscription.condition.notify_all()
+            try:
+                subscription.callback(params)
+                self.counters.add(event_name, "delivered")
+            except Exception:
+                self.counters.add(event_name, "errors")
+                logger.exception("Error in %s event listener", event_name)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return the per-event counters, see :meth:`EventCounters.snapshot`."""
+        return self.counters.snapshot()
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop all listeners and release the worker threads."""
+        with self._lock:
+            keys = list(self._subscriptions)
+        for key in keys:
+            self.unsubscribe(key)
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
@@ -35,6 +35,8 @@ from .errorhandler import ErrorCode
 
 LOGGER = logging.getLogger(__name__)
 
+MAX_REDIRECTS = 10
+
 remote_commands = {
     Command.NEW_SESSION: ("POST", "/session"),
     Command.QUIT: ("DELETE", "/session/$sessionId"),
@@ -267,6 +269,29 @@ class RemoteConnection:
 
         return headers
 
+    def _get_request_headers(self, parsed_url):
+        """Get the headers for a request to parsed_url.
+
+        Headers only depend on the connection settings, not on the request path,
+        so they are built once and reused until the user agent, extra headers or
+        URL credentials change. Subclasses add per-request headers on top.
+        """
+        cache_key = (parsed_url.username, parsed_url.password, self.user_agent, id(self.extra_headers))
+        cached = self._headers_cache
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
+
+        headers = self.get_remote_connection_headers(parsed_url._replace(path=""), self._client_config.keep_alive)
+        auth_header = self._client_config.get_auth_header()
+        if auth_header:
+            headers.update(auth_header)
+        self._headers_cache = (cache_key, headers)
+        return headers
+
+    def reset_headers_cache(self):
+        """Rebuild the request headers on the next request, e.g. after changing extra_headers in place."""
+        self._headers_cache = None
+
     def _identify_http_proxy_auth(self):
         parsed_url = urlparse(self._proxy_url)
         if parsed_url.username and parsed_url.password:
@@ -367,6 +392,7 @@ class RemoteConnection:
         if self._client_config.keep_alive:
             self._conn = self._get_connection_manager()
         self._commands = remote_commands
+        self._headers_cache = None
 
     extra_commands = {}
 
@@ -415,56 +441,74 @@ class RemoteConnection:
           A dictionary with the server's parsed JSON response.
         """
         parsed_url = parse.urlparse(url)
-        headers = self.get_remote_connection_headers(parsed_url, self._client_config.keep_alive)
-        auth_header = self._client_config.get_auth_header()
-
-        if auth_header:
-            headers.update(auth_header)
+        headers = self._get_request_headers(parsed_url)
 
         if body and method not in ("POST", "PUT"):
             body = None
 
-        if self._client_config.keep_alive:
-            response = self._conn.request(method, url, body=body, headers=headers, timeout=self._client_config.timeout)
-            statuscode = response.status
-        else:
-            conn = self._get_connection_manager()
-            with conn as http:
-                response = http.request(method, url, body=body, headers=headers, timeout=self._client_config.timeout)
+        redirects = 0
+        while True:
+            response = self._send_request(method, url, body, headers)
             statuscode = response.status
-        data = response.data.decode("UTF-8")
-        LOGGER.debug("Remote response: status=%s | data=%s | headers=%s", response.status, data, response.headers)
+            if not 300 <= statuscode < 304:
+                break
+            location = response.headers.get("location", None)
+            response.close()
+            if not location:
+                return {"status": ErrorCode.UNKNOWN_ERROR, "value": f"Redirect {statuscode} from {url} has no location"}
+            if redirects >= MAX_REDIRECTS:
+                return {"status": ErrorCode.UNKNOWN_ERROR, "value": f"Too many redirects, last location: {location}"}
+            redirects += 1
+            method, url, body = "GET", parse.urljoin(url, location), None
+            headers = self._get_request_headers(parse.urlparse(url))
+
+        # Keep the body as bytes: json can parse them directly, so large page sources
+        # and screenshots are not copied again by decode() and strip()
+        data = response.data
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                "Remote response: status=%s | data=%s | headers=%s",
+                response.status,
+                data.decode("UTF-8", errors="replace"),
+                response.headers,
+            )
         try:
-            if 300 <= statuscode < 304:
-                return self._request("GET", response.headers.get("location", None))
             if 399 < statuscode <= 500:
                 if statuscode == 401:
                     return {"status": statuscode, "value": "Authorization Required"}
-                return {"status": statuscode, "value": str(statuscode) if not data else data.strip()}
+                return {"status": statuscode, "value": str(statuscode) if not data else data.decode("UTF-8").strip()}
             content_type = []
             if response.headers.get("Content-Type", None):
                 content_type = response.headers.get("Content-Type", None).split(";")
             if not any([x.startswith("image/png") for x in content_type]):
                 try:
-                    data = utils.load_json(data.strip())
+                    data = utils.load_json(data)
                 except ValueError:
                     if 199 < statuscode < 300:
                         status = ErrorCode.SUCCESS
                     else:
                         status = ErrorCode.UNKNOWN_ERROR
-                    return {"status": status, "value": data.strip()}
+                    return {"status": status, "value": data.decode("UTF-8", errors="replace").strip()}
 
                 # Some drivers incorrectly return a response
                 # with no 'value' field when they should return null.
                 if "value" not in data:
                     data["value"] = None
                 return data
+            # Raw PNG bytes are not text, so hand them over undecoded
             data = {"status": 0, "value": data}
             return data
         finally:
             LOGGER.debug("Finished Request")
             response.close()
 
+    def _send_request(self, method, url, body, headers):
+        if self._client_config.keep_alive:
+            return self._conn.request(method, url, body=body, headers=headers, timeout=self._client_config.timeout)
+        conn = self._get_connection_manager()
+        with conn as http:
+            return http.request(method, url, body=body, headers=headers, timeout=self._client_config.timeout)
+
     def close(self):
         """Clean up resources when finished with the remote_connection."""
         if hasattr(self, "_conn"):
@@ -15,14 +15,108 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import importlib
 import json
 from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
 from typing import Union
 
 
+class JsonCodec(NamedTuple):
+    name: str
+    dumps: Callable[[Any], str]
+    loads: Callable[[Union[str, bytes]], Any]
+
+
+def _stdlib_codec() -> JsonCodec:
+    return JsonCodec("json", json.dumps, json.loads)
+
+
+def _orjson_codec() -> JsonCodec:
+    orjson = importlib.import_module("orjson")
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+
+    return JsonCodec("orjson", dumps, orjson.loads)
+
+
+def _ujson_codec() -> JsonCodec:
+    ujson = importlib.import_module("ujson")
+
+    def dumps(obj: Any) -> str:
+        return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+
+    return JsonCodec("ujson", dumps, ujson.loads)
+
+
+# Codec factories in order of preference; a factory raises ImportError when its package is missing.
+_codec_factories: Dict[str, Callable[[], JsonCodec]] = {
+    "orjson": _orjson_codec,
+    "ujson": _ujson_codec,
+    "json": _stdlib_codec,
+}
+
+_fallback = _stdlib_codec()
+_codec = _fallback
+
+
+def register_codec(name: str, factory: Callable[[], JsonCodec], preferred: bool = False) -> None:
+    """Register a JSON codec factory, optionally ahead of the built-in ones."""
+    global _codec_factories
+    if preferred:
+        _codec_factories = {name: factory, **{k: v for k, v in _codec_factories.items() if k != name}}
+    else:
+        _codec_factories[name] = factory
+
+
+def available_codecs() -> List[str]:
+    """Names of the registered codecs whose packages can be imported."""
+    names = []
+    for name, factory in _codec_factories.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def use_codec(name: str) -> JsonCodec:
+    """Switch dump_json/load_json to the named codec."""
+    global _codec
+    _codec = _codec_factories[name]()
+    return _codec
+
+
+def get_codec() -> JsonCodec:
+    return _codec
+
+
+def _select_codec() -> None:
+    for name in _codec_factories:
+        try:
+            use_codec(name)
+            return
+        except ImportError:
+            continue
+
+
 def dump_json(json_struct: Any) -> str:
-    return json.dumps(json_struct)
+    try:
+        return _codec.dumps(json_struct)
+    except TypeError:
+        # Fast codecs reject some values (e.g. non-str keys, huge ints) that json handles
+        if _codec is _fallback:
+            raise
+        return _fallback.dumps(json_struct)
 
 
 def load_json(s: Union[str, bytes]) -> Any:
-    return json.loads(s)
+    return _codec.loads(s)
+
+
+_select_codec()
@@ -69,7 +69,6 @@ from .script_key import ScriptKey
 from .shadowroot import ShadowRoot
 from .switch_to import SwitchTo
 from .webelement import WebElement
-from .websocket_connection import WebSocketConnection
 
 cdp = None
 devtools = None
@@ -1206,6 +1205,8 @@ class WebDriver(BaseWebDriver):
                         DeprecationWarning,
                         stacklevel=2,
                     )
+            from .websocket_connection import WebSocketConnection
+
             self._websocket_connection = WebSocketConnection(ws_url)
             targets = self._websocket_connection.execute(devtools.target.get_targets())
             target_id = targets[0].target_id
@@ -1249,6 +1250,8 @@ class WebDriver(BaseWebDriver):
         else:
             raise WebDriverException("Unable to find url to connect to from capabilities")
 
+        from .websocket_connection import WebSocketConnection
+
         self._websocket_connection = WebSocketConnection(ws_url)
 
     def _get_cdp_details(self):
@@ -17,51 +17,81 @@
 import json
 import logging
 from ssl import CERT_NONE
+from threading import Event
+from threading import Lock
 from threading import Thread
-from time import sleep
 
 from websocket import WebSocketApp  # type: ignore
 
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
+
+from .event_dispatcher import DEFAULT_BUFFER_SIZE
+from .event_dispatcher import DEFAULT_WORKERS
+from .event_dispatcher import DROP
+from .event_dispatcher import EventDispatcher
+
 logger = logging.getLogger(__name__)
 
 
 class WebSocketConnection:
     _response_wait_timeout = 30
-    _response_wait_interval = 0.1
 
     _max_log_message_size = 9999
 
-    def __init__(self, url):
+    def __init__(self, url, event_buffer_size=DEFAULT_BUFFER_SIZE, event_policy=DROP, event_workers=DEFAULT_WORKERS):
         self.callbacks = {}
         self.session_id = None
         self.url = url
+        # Event callbacks run on the dispatcher's workers, never on the socket thread
+        self.events = EventDispatcher(buffer_size=event_buffer_size, policy=event_policy, workers=event_workers)
 
         self._id = 0
         self._messages = {}
+        self._pending = {}
+        self._lock = Lock()
         self._started = False
+        self._started_event = Event()
 
         self._start_ws()
-        self._wait_until(lambda: self._started)
+        self._started_event.wait(self._response_wait_timeout)
 
     def close(self):
         self._ws_thread.join(timeout=self._response_wait_timeout)
         self._ws.close()
         self._started = False
         self._ws = None
+        self.events.shutdown()
 
     def execute(self, command):
-        self._id += 1
+        # Each caller waits on its own event, set by the socket thread as soon as
+        # the response with its id arrives, instead of polling for it.
+        with self._lock:
+            self._id += 1
+            message_id = self._id
+            arrived = self._pending[message_id] = Event()
+
         payload = self._serialize_command(command)
-        payload["id"] = self._id
+        payload["id"] = message_id
         if self.session_id:
             payload["sessionId"] = self.session_id
 
         data = json.dumps(payload)
         logger.debug(f"-> {data}"[: self._max_log_message_size])
-        self._ws.send(data)
-
-        self._wait_until(lambda: self._id in self._messages)
-        response = self._messages.pop(self._id)
+        try:
+            self._ws.send(data)
+            received = arrived.wait(self._response_wait_timeout)
+        finally:
+            with self._lock:
+                self._pending.pop(message_id, None)
+                response = self._messages.pop(message_id, None)
+
+        if response is None:
+            if not received:
+                raise TimeoutException(
+                    f"No response to WebSocket message {message_id} within {self._response_wait_timeout}s"
+                )
+            raise WebDriverException(f"WebSocket connection closed before message {message_id} got a response")
 
         if "error" in response:
             raise Exception(response["error"])
@@ -69,7 +99,14 @@ class WebSocketConnection:
             result = response["result"]
             return self._deserialize_result(result, command)
 
-    def add_callback(self, event, callback):
+    def add_callback(self, event, callback, buffer_size=None, policy=None):
+        """Call ``callback`` with every ``event`` received.
+
+        :param buffer_size: events queued for this callback before the
+            overflow policy applies; defaults to the connection's
+        :param policy: ``"drop"``, ``"coalesce"`` or ``"block"``; defaults
+            to the connection's
+        """
         event_name = event.event_class
         if event_name not in self.callbacks:
             self.callbacks[event_name] = []
@@ -77,6 +114,7 @@ class WebSocketConnection:
         def _callback(params):
             callback(event.from_json(params))
 
+        self.events.subscribe(id(_callback), _callback, buffer_size=buffer_size, policy=policy)
         self.callbacks[event_name].append(_callback)
         return id(_callback)
 
@@ -88,6 +126,7 @@ class WebSocketConnection:
             for callback in self.callbacks[event_name]:
                 if id(callback) == callback_id:
                     self.callbacks[event_name].remove(callback)
+                    self.events.unsubscribe(callback_id)
                     return
 
     def _serialize_command(self, command):
@@ -103,6 +142,14 @@ class WebSocketConnection:
     def _start_ws(self):
         def on_open(ws):
             self._started = True
+            self._started_event.set()
+
+        def on_close(ws, *args):
+            # Wake every caller still waiting; they will find no response and raise
+            with self._lock:
+                pending = list(self._pending.values())
+            for arrived in pending:
+                arrived.set()
 
         def on_message(ws, message):
             self._process_message(message)
@@ -117,7 +164,9 @@ class WebSocketConnection:
             else:
                 self._ws.run_forever(suppress_origin=True)
 
-        self._ws = WebSocketApp(self.url, on_open=on_open, on_message=on_message, on_error=on_error)
+        self._ws = WebSocketApp(
+            self.url, on_open=on_open, on_message=on_message, on_error=on_error, on_close=on_close
+        )
         self._ws_thread = Thread(target=run_socket)
         self._ws_thread.start()
 
@@ -126,21 +175,14 @@ class WebSocketConnection:
         logger.debug(f"<- {message}"[: self._max_log_message_size])
 
         if "id" in message:
-            self._messages[message["id"]] = message
+            with self._lock:
+                arrived = self._pending.get(message["id"])
+                if arrived is not None:
+                    self._messages[message["id"]] = message
+            if arrived is not None:
+                arrived.set()
 
         if "method" in message:
             params = message["params"]
             for callback in self.callbacks.get(message["method"], []):
-                callback(params)
-
-    def _wait_until(self, condition):
-        timeout = self._response_wait_timeout
-        interval = self._response_wait_interval
-
-        while timeout > 0:
-            result = condition()
-            if result:
-                return result
-            else:
-                timeout -= interval
-                sleep(interval)
+                self.events.dispatch(id(callback), message["method"], params)
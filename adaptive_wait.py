@@ -0,0 +1,179 @@
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.wait import WebDriverWait
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+
+STATS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "locator_stats.json")
+
+INITIAL_POLL = 0.05
+MAX_POLL = 0.5
+BACKOFF = 1.5
+
+# Upper edges (seconds) of the time-to-appear histogram buckets; the last bucket is open-ended
+BUCKETS = [0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10]
+MAX_SAMPLES = 200
+MIN_SAMPLES = 5
+# Slow locators get p95 times this much as timeout; ones that timed out before up to MAX_WIDEN times the caller's
+HEADROOM = 3
+MAX_WIDEN = 2
+
+def locator_key(locator):
+    """Turn a (by, value) locator into the key its stats are stored under"""
+    by, value = locator
+    return f"{by}={value}"
+
+class LocatorStats:
+    """Time-to-appear histogram and recent samples per locator, persisted between runs"""
+
+    def __init__(self, path=STATS_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Read stats recorded by earlier runs"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                self.stats = json.load(f)
+        except Exception as e:
+            print(f"Error loading locator stats: {e}")
+            self.stats = {}
+
+    def save(self):
+        """Write the stats back to disk if anything was recorded"""
+        with self.lock:
+            if not self.dirty:
+                return
+            try:
+                with open(self.path, "w") as f:
+                    json.dump(self.stats, f, indent=1)
+                self.dirty = False
+            except Exception as e:
+                print(f"Error saving locator stats: {e}")
+
+    def _entry(self, key):
+        return self.stats.setdefault(key, {
+            "histogram": [0] * (len(BUCKETS) + 1),
+            "samples": [],
+            "timeouts": 0
+        })
+
+    def record(self, locator, seconds):
+        """Record how long the locator took to appear"""
+        with self.lock:
+            entry = self._entry(locator_key(locator))
+            entry["histogram"][bisect.bisect_left(BUCKETS, seconds)] += 1
+            entry["samples"] = (entry["samples"] + [round(seconds, 4)])[-MAX_SAMPLES:]
+            self.dirty = True
+
+    def record_timeout(self, locator):
+        """Record that the locator never appeared"""
+        with self.lock:
+            self._entry(locator_key(locator))["timeouts"] += 1
+            self.dirty = True
+
+    def percentile(self, locator, pct):
+        """Return the pct percentile of recent times-to-appear, or None without enough samples"""
+        with self.lock:
+            samples = sorted(self.stats.get(locator_key(locator), {}).get("samples", []))
+        if len(samples) < MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+    def suggested_timeout(self, locator, default):
+        """Caller's timeout, widened for locators that are slow to appear or timed out before; never shorter"""
+        p95 = self.percentile(locator, 95)
+        timeout = default if p95 is None else max(default, p95 * HEADROOM)
+        with self.lock:
+            entry = self.stats.get(locator_key(locator), {})
+            timeouts = entry.get("timeouts", 0)
+            found = len(entry.get("samples", []))
+        if timeouts:
+            # The more often the locator timed out, the closer the wait gets to MAX_WIDEN times the default
+            timeout = max(timeout, default * (1 + (MAX_WIDEN - 1) * timeouts / (timeouts + found)))
+        return min(timeout, default * MAX_WIDEN)
+
+    def initial_poll(self, locator):
+        """First poll interval: a fraction of the typical time-to-appear, within INITIAL_POLL..MAX_POLL"""
+        median = self.percentile(locator, 50)
+        if median is None:
+            return INITIAL_POLL
+        return min(MAX_POLL, max(INITIAL_POLL, median / 4))
+
+    def histogram(self, locator):
+        """Return (bucket label, count) pairs for the locator"""
+        with self.lock:
+            counts = list(self.stats.get(locator_key(locator), {}).get("histogram", []))
+        labels = [f"<={edge}s" for edge in BUCKETS] + [f">{BUCKETS[-1]}s"]
+        return list(zip(labels, counts))
+
+locator_stats = LocatorStats()
+atexit.register(locator_stats.save)
+
+class AdaptiveWebDriverWait(WebDriverWait):
+    """WebDriverWait that polls fast first and backs off exponentially, recording time-to-appear per locator"""
+
+    def __init__(self, driver, timeout, locator=None, initial_poll=None, max_poll=MAX_POLL,
+                 backoff=BACKOFF, ignored_exceptions=None, stats=None):
+        self._stats = stats or locator_stats
+        self._locator = locator
+        if initial_poll is None:
+            initial_poll = self._stats.initial_poll(locator) if locator else INITIAL_POLL
+        super().__init__(driver, timeout, poll_frequency=initial_poll, ignored_exceptions=ignored_exceptions)
+        self._max_poll = max_poll
+        self._backoff = backoff
+
+    def until(self, method, message=""):
+        screen = None
+        stacktrace = None
+
+        started = time.monotonic()
+        end_time = started + self._timeout
+        poll = self._poll
+        while True:
+            try:
+                value = method(self._driver)
+                if value:
+                    if self._locator:
+                        self._stats.record(self._locator, time.monotonic() - started)
+                    return value
+            except self._ignored_exceptions as exc:
+                screen = getattr(exc, "screen", None)
+                stacktrace = getattr(exc, "stacktrace", None)
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(poll, remaining))
+            poll = min(self._max_poll, poll * self._backoff)
+        if self._locator:
+            self._stats.record_timeout(self._locator)
+        raise TimeoutException(message, screen, stacktrace)
+
+    def until_not(self, method, message=""):
+        end_time = time.monotonic() + self._timeout
+        poll = self._poll
+        while True:
+            try:
+                value = method(self._driver)
+                if not value:
+                    return value
+            except self._ignored_exceptions:
+                return True
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(poll, remaining))
+            poll = min(self._max_poll, poll * self._backoff)
+        raise TimeoutException(message)
+
+def adaptive_wait(driver, locator, timeout=10):
+    """Build an AdaptiveWebDriverWait whose timeout and first poll come from earlier runs"""
+    return AdaptiveWebDriverWait(driver, locator_stats.suggested_timeout(locator, timeout), locator=locator)
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+PREFLIGHT_TTL = 300
+DEVICES_TTL = 5
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+def _cached(key, ttl):
+    with _cache_lock:
+        entry = _cache.get(key)
+    if entry and time.monotonic() - entry[0] < ttl:
+        return entry[1]
+    return None
+
+def _store(key, value):
+    with _cache_lock:
+        _cache[key] = (time.monotonic(), value)
+    return value
+
+def clear_cache(device_id=None):
+    """Forget cached adb state for one device, or for everything"""
+    with _cache_lock:
+        for key in list(_cache):
+            if device_id is None or device_id in key:
+                del _cache[key]
+
+async def run_adb(*args):
+    """Run an adb command without blocking the event loop and return its stdout"""
+    process = await asyncio.create_subprocess_exec(
+        'adb', *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, _ = await process.communicate()
+    return stdout.decode('utf-8', errors='replace')
+
+async def list_devices():
+    """Get the serials of connected Android devices that are ready for use"""
+    cached = _cached(("devices",), DEVICES_TTL)
+    if cached is not None:
+        return list(cached)
+    try:
+        output = await run_adb('devices')
+    except Exception as e:
+        print(f"Error getting device list: {e}")
+        return []
+    devices = []
+    for line in output.strip().split('\n')[1:]:
+        parts = line.strip().split('\t')
+        if len(parts) == 2 and parts[1] == 'device':
+            devices.append(parts[0])
+    return list(_store(("devices",), devices))
+
+async def preflight_device(device_id, package, permissions):
+    """Check the app is installed and grant its permissions in a single adb shell round trip"""
+    key = (device_id, package, tuple(permissions))
+    cached = _cached(key, PREFLIGHT_TTL)
+    if cached is not None:
+        return cached
+
+    commands = [f"pm list packages {package}"]
+    commands += [f"pm grant {package} {permission} 2>/dev/null" for permission in permissions]
+    try:
+        output = await run_adb('-s', device_id, 'shell', '; '.join(commands))
+    except Exception as e:
+        print(f"Error running preflight on {device_id}: {e}")
+        return False
+
+    installed = f"package:{package}" in output.split()
+    # Only cache a good result so a fresh install is picked up on the next run
+    return _store(key, True) if installed else False
+
+async def preflight_all(devices, package, permissions):
+    """Run preflight on every device at the same time"""
+    results = await asyncio.gather(*(preflight_device(d, package, permissions) for d in devices))
+    return dict(zip(devices, results))
+
+def get_connected_devices():
+    """Get a list of connected Android devices using adb"""
+    return asyncio.run(list_devices())
+
+def preflight(device_id, package, permissions):
+    """Blocking preflight for a single device"""
+    return asyncio.run(preflight_device(device_id, package, permissions))
+
+def run_preflight(devices, package, permissions):
+    """Blocking preflight for a list of devices, run in parallel"""
+    return asyncio.run(preflight_all(devices, package, permissions))
@@ -0,0 +1,256 @@
+from appium.options.common.base import AppiumOptions
+from appium.webdriver.errorhandler import MobileErrorHandler
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
+from selenium.webdriver.remote.utils import dump_json, load_json
+from locator_optimizer import optimize_locator
+from urllib.parse import urlparse
+import asyncio
+import h11
+
+ELEMENT_KEYS = ("element-6066-11e4-a52e-4f735466cecf", "ELEMENT")
+# Requests that can safely reach the server twice; a repeated POST could click or type twice
+IDEMPOTENT_METHODS = {"GET", "DELETE"}
+
+class AsyncHTTPConnection:
+    """Keep-alive HTTP/1.1 connection to one server, driven by h11 on asyncio streams"""
+
+    def __init__(self, host, port, timeout=120):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = None
+        self.writer = None
+        self.connection = None
+        self.sent = False
+        self.lock = asyncio.Lock()
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.connection = h11.Connection(our_role=h11.CLIENT)
+
+    async def _send(self, event):
+        self.writer.write(self.connection.send(event))
+
+    async def _next_event(self):
+        while True:
+            event = self.connection.next_event()
+            if event is h11.NEED_DATA:
+                self.connection.receive_data(await self.reader.read(65536))
+                continue
+            return event
+
+    async def request(self, method, path, body=None):
+        """Send one request and return (status, body bytes), reusing the socket when the server allows it"""
+        async with self.lock:
+            reused = self.connection is not None and self.connection.our_state is h11.IDLE
+            # A keep-alive socket the server already closed is replaced before anything is written to it
+            if not reused or self.reader.at_eof():
+                reused = False
+                await self.close()
+                await self._connect()
+            try:
+                return await self._round_trip(method, path, body)
+            except asyncio.TimeoutError:
+                # The server may still act on the request, so it is never sent again
+                await self.close()
+                raise
+            except (OSError, h11.RemoteProtocolError):
+                if not reused or (self.sent and method not in IDEMPOTENT_METHODS):
+                    await self.close()
+                    raise
+            # The server dropped the idle keep-alive socket; retry once on a fresh one
+            await self.close()
+            await self._connect()
+            return await self._round_trip(method, path, body)
+
+    async def _round_trip(self, method, path, body):
+        headers = [
+            ("Host", f"{self.host}:{self.port}"),
+            ("Accept", "application/json"),
+            ("Content-Type", "application/json;charset=UTF-8"),
+            ("Content-Length", str(len(body) if body else 0))
+        ]
+        self.sent = False
+        request = self.connection.send(h11.Request(method=method, target=path, headers=headers))
+        # From here on the server may have received the request
+        self.sent = True
+        self.writer.write(request)
+        if body:
+            await self._send(h11.Data(data=body))
+        await self._send(h11.EndOfMessage())
+        await self.writer.drain()
+
+        status, data = await asyncio.wait_for(self._read_response(), self.timeout)
+        if status is None:
+            raise ConnectionResetError(f"Connection to {self.host}:{self.port} closed before a response")
+        if self.connection.our_state is h11.DONE and self.connection.their_state is h11.DONE:
+            self.connection.start_next_cycle()
+        return status, data
+
+    async def _read_response(self):
+        status = None
+        chunks = []
+        while True:
+            event = await self._next_event()
+            if isinstance(event, h11.Response):
+                status = event.status_code
+            elif isinstance(event, h11.Data):
+                chunks.append(event.data)
+            elif isinstance(event, (h11.EndOfMessage, h11.ConnectionClosed)):
+                return status, b"".join(chunks)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+        self.reader = self.writer = self.connection = None
+
+class AsyncWebElement:
+    """Awaitable counterpart of WebElement"""
+
+    def __init__(self, driver, element_id):
+        self.driver = driver
+        self.id = element_id
+
+    def _path(self, suffix=""):
+        return f"/element/{self.id}{suffix}"
+
+    async def click(self):
+        await self.driver.execute("POST", self._path("/click"), {})
+
+    async def send_keys(self, text):
+        await self.driver.execute("POST", self._path("/value"), {"text": text, "value": list(text)})
+
+    async def clear(self):
+        await self.driver.execute("POST", self._path("/clear"), {})
+
+    async def get_attribute(self, name):
+        return await self.driver.execute("GET", self._path(f"/attribute/{name}"))
+
+    async def text(self):
+        return await self.driver.execute("GET", self._path("/text"))
+
+    async def is_displayed(self):
+        return await self.driver.execute("GET", self._path("/displayed"))
+
+    async def is_enabled(self):
+        return await self.driver.execute("GET", self._path("/enabled"))
+
+    async def find_element(self, by, value):
+        by, value = optimize_locator(by, value, from_element=True)
+        result = await self.driver.execute("POST", self._path("/element"), {"using": by, "value": value})
+        return self.driver._wrap(result)
+
+    async def find_elements(self, by, value):
+        by, value = optimize_locator(by, value, from_element=True)
+        result = await self.driver.execute("POST", self._path("/elements"), {"using": by, "value": value})
+        return [self.driver._wrap(item) for item in result]
+
+class AsyncRemote:
+    """Asyncio counterpart of appium.webdriver.Remote for driving many sessions from one event loop"""
+
+    def __init__(self, command_executor):
+        parsed = urlparse(command_executor)
+        self.base_path = parsed.path.rstrip("/")
+        self.http = AsyncHTTPConnection(parsed.hostname, parsed.port or 80)
+        self.error_handler = MobileErrorHandler()
+        self.session_id = None
+        self.caps = {}
+
+    @classmethod
+    async def create(cls, command_executor, options):
+        """Open a session, the same way webdriver.Remote(command_executor, options=options) does"""
+        driver = cls(command_executor)
+        await driver.start_session(options)
+        return driver
+
+    async def start_session(self, options):
+        w3c_caps = AppiumOptions.as_w3c(options) if isinstance(options, dict) else options.to_w3c()
+        response = await self._send("POST", "/session", w3c_caps)
+        value = response.get("value") if isinstance(response.get("value"), dict) else {}
+        self.session_id = response.get("sessionId") or value.get("sessionId")
+        if not self.session_id:
+            raise SessionNotCreatedException(f'A valid W3C session creation response must contain a non-empty "sessionId" entry. Got "{response}" instead')
+        self.caps = response.get("capabilities") or value.get("capabilities") or {}
+
+    async def _send(self, method, path, params=None):
+        body = dump_json(params).encode("utf-8") if params is not None and method == "POST" else None
+        status, data = await self.http.request(method, f"{self.base_path}{path}", body)
+        text = data.decode("utf-8")
+        if 399 < status <= 500:
+            self.error_handler.check_response({"status": status, "value": text})
+        try:
+            response = load_json(text) if text.strip() else {}
+        except ValueError:
+            # Like the sync RemoteConnection, a non-JSON body is the value, or the error message on failure
+            if not 199 < status < 300:
+                raise WebDriverException(f"HTTP {status} from {path}: {text.strip()}")
+            response = {"value": text.strip()}
+        if "value" not in response:
+            response["value"] = None
+        self.error_handler.check_response(response)
+        return response
+
+    async def execute(self, method, path, params=None):
+        """Send a session command and return its value"""
+        response = await self._send(method, f"/session/{self.session_id}{path}", params)
+        return response["value"]
+
+    def _wrap(self, result):
+        for key in ELEMENT_KEYS:
+            if key in result:
+                return AsyncWebElement(self, result[key])
+        raise ValueError(f"Not an element reference: {result}")
+
+    async def find_element(self, by, value):
+        by, value = optimize_locator(by, value)
+        return self._wrap(await self.execute("POST", "/element", {"using": by, "value": value}))
+
+    async def find_elements(self, by, value):
+        by, value = optimize_locator(by, value)
+        return [self._wrap(item) for item in await self.execute("POST", "/elements", {"using": by, "value": value})]
+
+    async def page_source(self):
+        return await self.execute("GET", "/source")
+
+    async def get_status(self):
+        return (await self._send("GET", "/status"))["value"]
+
+    async def execute_script(self, script, *args):
+        return await self.execute("POST", "/execute/sync", {"script": script, "args": list(args)})
+
+    async def terminate_app(self, app_id):
+        return await self.execute_script("mobile: terminateApp", {"appId": app_id})
+
+    async def activate_app(self, app_id):
+        return await self.execute_script("mobile: activateApp", {"appId": app_id})
+
+    async def wait_for_element(self, by, value, timeout=10, poll=0.05, max_poll=0.5):
+        """Poll for an element with backoff, yielding to the event loop between polls"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            elements = await self.find_elements(by, value)
+            if elements:
+                return elements[0]
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return None
+            await asyncio.sleep(min(poll, remaining))
+            poll = min(max_poll, poll * 1.5)
+
+    async def quit(self):
+        try:
+            if self.session_id:
+                await self._send("DELETE", f"/session/{self.session_id}")
+        finally:
+            self.session_id = None
+            await self.http.close()
+
+async def run_on_devices(workflow, devices):
+    """Run workflow(device_id) coroutines for every device concurrently and return results by device"""
+    results = await asyncio.gather(*(workflow(device_id) for device_id in devices), return_exceptions=True)
+    return dict(zip(devices, results))
@@ -0,0 +1,36 @@
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import TimeoutException
+from adaptive_wait import adaptive_wait
+from page_snapshot import PageSnapshot
+
+def resolve_children(snapshot, parent_xpath, children):
+    """Find the first parent matching parent_xpath and each of its relative child locators"""
+    parent = snapshot.find(AppiumBy.XPATH, parent_xpath)
+    if parent is None:
+        return None
+    record = parent.record()
+    record["children"] = {}
+    for name, child_xpath in children.items():
+        child = parent.find(child_xpath)
+        record["children"][name] = child.record() if child is not None else None
+    return record
+
+def find_with_children(driver, parent_xpath, children):
+    """Resolve a parent and its child locators from one page_source round trip"""
+    return resolve_children(PageSnapshot.from_driver(driver), parent_xpath, children)
+
+def wait_for_children(driver, parent_xpath, children, timeout=10):
+    """Wait for the parent to appear and return its batched record"""
+    try:
+        wait = adaptive_wait(driver, (AppiumBy.XPATH, parent_xpath), timeout)
+        return wait.until(lambda d: find_with_children(d, parent_xpath, children))
+    except TimeoutException:
+        print(f"Element not found: {parent_xpath}")
+        return None
+
+def tap_record(driver, record):
+    """Tap the middle of an element record"""
+    if not record or not record["center"]:
+        return False
+    driver.tap([record["center"]])
+    return True
@@ -0,0 +1,263 @@
+from selenium.webdriver.remote import utils
+from selenium.webdriver.remote.websocket_connection import WebSocketConnection
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import json
+import queue
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+def synthetic_responses(nodes=3000):
+    """Appium-shaped responses: a large page source, a findElements result and a small command reply"""
+    node = ('<android.view.View index="0" package="com.reddit.frontpage" class="android.view.View" '
+            'text="" resource-id="post_unit" checkable="false" checked="false" clickable="true" '
+            'enabled="true" focusable="true" focused="false" long-clickable="false" password="false" '
+            'scrollable="false" selected="false" bounds="[0,210][1080,1466]" displayed="true" />')
+    page_source = '<?xml version="1.0" encoding="UTF-8"?><hierarchy>' + node * nodes + '</hierarchy>'
+    elements = [{"element-6066-11e4-a52e-4f735466cecf": f"00000000-0000-0000-{i:04d}-000000000000"} for i in range(200)]
+    return {
+        "page_source": json.dumps({"value": page_source}).encode('utf-8'),
+        "find_elements": json.dumps({"value": elements}).encode('utf-8'),
+        "click": json.dumps({"value": None}).encode('utf-8')
+    }
+
+def load_responses(paths):
+    """Read recorded response bodies (one JSON response per file)"""
+    responses = {}
+    for path in paths:
+        with open(path, 'rb') as f:
+            responses[path] = f.read()
+    return responses
+
+def time_call(func, arg, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(arg)
+    return (time.perf_counter() - started) / repeat
+
+def bench_json(paths=None, repeat=50):
+    """Time load_json/dump_json for every available codec on recorded or synthetic Appium responses"""
+    responses = load_responses(paths) if paths else synthetic_responses()
+    original = utils.get_codec().name
+    print(f"{'codec':8} {'response':>24} {'bytes':>10} {'load ms':>9} {'dump ms':>9}")
+    try:
+        for name in utils.available_codecs():
+            utils.use_codec(name)
+            for label, body in responses.items():
+                decoded = utils.load_json(body)
+                load_ms = time_call(utils.load_json, body, repeat) * 1000
+                dump_ms = time_call(utils.dump_json, decoded, repeat) * 1000
+                print(f"{name:8} {label[-24:]:>24} {len(body):>10} {load_ms:>9.3f} {dump_ms:>9.3f}")
+    finally:
+        utils.use_codec(original)
+
+class LoopbackSocket:
+    """Stands in for the browser end of a CDP/BiDi socket: answers each message after a fixed delay"""
+
+    def __init__(self, connection, delay):
+        self.connection = connection
+        self.delay = delay
+        self.inbox = queue.Queue()
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    def _serve(self):
+        while True:
+            message = self.inbox.get()
+            if message is None:
+                return
+            time.sleep(self.delay)
+            reply = {"id": json.loads(message)["id"], "result": {}}
+            self.connection._process_message(json.dumps(reply))
+
+    def send(self, message):
+        self.inbox.put(message)
+
+    def close(self):
+        self.inbox.put(None)
+
+class LoopbackConnection(WebSocketConnection):
+    """WebSocketConnection wired to a LoopbackSocket instead of a real browser"""
+
+    delay = 0.001
+
+    def _start_ws(self):
+        self._ws = LoopbackSocket(self, self.delay)
+        self._started = True
+        self._started_event.set()
+
+class PollingLoopbackConnection(LoopbackConnection):
+    """The previous response wait: check for the reply, then sleep 0.1s, until it shows up"""
+
+    def execute(self, command):
+        with self._lock:
+            self._id += 1
+            message_id = self._id
+            self._pending[message_id] = None
+        payload = self._serialize_command(command)
+        payload["id"] = message_id
+        self._ws.send(json.dumps(payload))
+        while message_id not in self._messages:
+            time.sleep(0.1)
+        with self._lock:
+            self._pending.pop(message_id)
+            return self._messages.pop(message_id)["result"]
+
+    def _process_message(self, message):
+        message = json.loads(message)
+        with self._lock:
+            self._messages[message["id"]] = message
+
+def noop_command():
+    yield {"method": "Runtime.evaluate", "params": {"expression": "1"}}
+
+def bench_websocket(args=None, repeat=30):
+    """Round-trip latency of WebSocketConnection.execute against a loopback peer, polling vs signaled"""
+    delays = [float(arg) / 1000 for arg in args] if args else [0.001, 0.02]
+    print(f"{'wait':8} {'server ms':>10} {'round trip ms':>14} {'overhead ms':>12}")
+    for delay in delays:
+        for label, cls in (("polling", PollingLoopbackConnection), ("signaled", LoopbackConnection)):
+            cls.delay = delay
+            connection = cls("ws://loopback")
+            try:
+                elapsed = time_call(lambda _: connection.execute(noop_command()), None, repeat)
+            finally:
+                connection._ws.close()
+            print(f"{label:8} {delay * 1000:>10.1f} {elapsed * 1000:>14.3f} {(elapsed - delay) * 1000:>12.3f}")
+
+IMPORT_PROBE = ("import sys, time; started = time.perf_counter(); import {module}; "
+                "print(time.perf_counter() - started, len(sys.modules))")
+
+def bench_imports(modules=None, repeat=10):
+    """Cold import time of each module in a fresh interpreter, median of several runs"""
+    modules = modules or ["appium.webdriver", "selenium.webdriver", "reddit_automation"]
+    print(f"{'module':28} {'median ms':>10} {'min ms':>8} {'modules':>8}")
+    for module in modules:
+        times = []
+        loaded = 0
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, "-c", IMPORT_PROBE.format(module=module)],
+                                    capture_output=True, text=True, check=True).stdout.split()
+            times.append(float(output[0]))
+            loaded = int(output[1])
+        print(f"{module:28} {statistics.median(times) * 1000:>10.1f} {min(times) * 1000:>8.1f} {loaded:>8}")
+
+ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf"
+FAKE_PAGE_SOURCE = '<?xml version="1.0" encoding="UTF-8"?><hierarchy>' + '<android.view.View text=""/>' * 200 + '</hierarchy>'
+
+class FakeAppiumHandler(BaseHTTPRequestHandler):
+    """Answers like an Appium server without execute_driver, after the server's latency, and counts requests"""
+
+    server_version = "FakeAppium"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.answer()
+
+    def do_POST(self):
+        self.answer()
+
+    def do_DELETE(self):
+        self.answer()
+
+    def answer(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self.server.requests += 1
+        time.sleep(self.server.latency)
+        status, value = 200, None
+        if self.path == "/session":
+            value = {"sessionId": "bench", "capabilities": {"platformName": "Android"}}
+        elif self.path.endswith("/appium/execute_driver"):
+            status, value = 404, {"error": "unknown method", "message": "execute_driver is not installed",
+                                  "stacktrace": ""}
+        elif self.path.endswith("/elements"):
+            value = [{ELEMENT_KEY: "e1"}]
+        elif self.path.endswith("/element"):
+            value = {ELEMENT_KEY: "e1"}
+        elif self.path.endswith("/source"):
+            value = FAKE_PAGE_SOURCE
+        elif self.path.endswith("/execute/sync"):
+            value = ".MainActivity"
+        elif self.path.endswith("/displayed") or self.path.endswith("/enabled"):
+            value = True
+        body = json.dumps({"value": value}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def run_twitter_script(driver):
+    """The Twitter flow as open_twitter runs it, after the session is set up"""
+    import twitter_automation as twitter
+    from ui_settle import wait_for_idle
+    wait_for_idle(driver, timeout=5)
+    twitter.like_post(driver)
+    wait_for_idle(driver, timeout=2)
+    twitter.comment_on_post(driver)
+    wait_for_idle(driver, timeout=2)
+    twitter.tap_post_button_twice(driver)
+    wait_for_idle(driver, timeout=2)
+    twitter.make_new_post(driver)
+    return True
+
+def run_twitter_workflow(driver):
+    """The same flow ported to the workflow engine"""
+    from workflow_engine import execute_workflow
+    from workflows import TWITTER_WORKFLOW
+    return execute_workflow(driver, TWITTER_WORKFLOW)["success"]
+
+def bench_workflow(args=None, repeat=3):
+    """Twitter flow as a script vs on the workflow engine, against a local fake Appium server with fixed latency"""
+    from appium import webdriver
+    from appium.options.common.base import AppiumOptions
+    import twitter_automation as twitter
+    from ui_settle import enable_idle_waits
+
+    latencies = [float(arg) / 1000 for arg in args] if args else [0.02, 0.09]
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAppiumHandler)
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    print(f"{'flow':10} {'latency ms':>10} {'median s':>9} {'requests':>9}")
+    try:
+        for latency in latencies:
+            server.latency = latency
+            for label, flow in (("script", run_twitter_script), ("engine", run_twitter_workflow)):
+                times = []
+                for _ in range(repeat):
+                    # A fresh session each time, so no run starts with another run's caches
+                    driver = twitter.prepare_driver(webdriver.Remote(url, options=AppiumOptions(),
+                                                                     direct_connection=False))
+                    enable_idle_waits(driver)
+                    server.requests = 0
+                    started = time.perf_counter()
+                    with redirect_stdout(io.StringIO()):
+                        flow(driver)
+                    times.append(time.perf_counter() - started)
+                    requests = server.requests
+                print(f"{label:10} {latency * 1000:>10.0f} {statistics.median(times):>9.2f} {requests:>9}")
+    finally:
+        server.shutdown()
+
+BENCHMARKS = {
+    "imports": bench_imports,
+    "json": bench_json,
+    "websocket": bench_websocket,
+    "workflow": bench_workflow
+}
+
+if __name__ == "__main__":
+
+    name = sys.argv[1] if len(sys.argv) > 1 else "json"
+    if name not in BENCHMARKS:
+        print(f"Unknown benchmark '{name}', choose from: {', '.join(BENCHMARKS)}")
+        sys.exit(1)
+    BENCHMARKS[name](sys.argv[2:] or None)
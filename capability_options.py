@@ -0,0 +1,68 @@
+from appium.options.common.base import AppiumOptions
+
+# UiAutomator2 capabilities by value type. Checking keys against this table replaces
+# importing UiAutomator2Options, whose ~95 single-capability mixin modules cost more
+# to import than building the session request itself.
+CAPABILITY_TABLE = {
+    str: (
+        "platformName", "automationName", "deviceName", "udid", "platformVersion", "browserName",
+        "app", "appPackage", "appActivity", "appWaitActivity", "appWaitPackage", "otherApps",
+        "uninstallOtherPackages", "intentAction", "intentCategory", "intentFlags", "optionalIntentArguments",
+        "language", "locale", "localeScript", "orientation", "avd", "avdArgs", "networkSpeed",
+        "remoteAdbHost", "buildToolsVersion", "logcatFormat", "mockLocationApp",
+        "unlockType", "unlockKey", "unlockStrategy", "mjpegScreenshotUrl",
+        "chromedriverExecutable", "chromedriverExecutableDir", "chromedriverChromeMappingFile",
+        "keystorePath", "keystorePassword", "keyAlias", "keyPassword"
+    ),
+    bool: (
+        "noReset", "fullReset", "autoGrantPermissions", "ignoreHiddenApiPolicyError", "disableWindowAnimation",
+        "skipDeviceInitialization", "skipServerInstallation", "skipUnlock", "skipLogcatCapture", "skipLogCapture",
+        "clearSystemFiles", "clearDeviceLogsOnStart", "enforceAppInstall", "allowTestPackages", "appWaitForLaunch",
+        "allowDelayAdb", "suppressKillServer", "gpsEnabled", "isHeadless", "autoWebview", "nativeWebScreenshot",
+        "ensureWebviewsHavePages", "showChromedriverLog", "recreateChromeDriverSessions",
+        "chromedriverDisableBuildCheck", "chromedriverUseSystemExecutable",
+        "extractChromeAndroidPackageFromContextName", "disableSuppressAccessibilityService",
+        "enablePerformanceLogging", "printPageSourceOnFindFailure", "eventTimings", "noSign", "useKeystore"
+    ),
+    int: (
+        "newCommandTimeout", "androidInstallTimeout", "androidDeviceReadyTimeout", "appWaitDuration",
+        "systemPort", "chromedriverPort", "mjpegServerPort", "adbPort", "webviewDevtoolsPort",
+        "adbExecTimeout", "avdLaunchTimeout", "avdReadyTimeout", "autoWebviewTimeout", "unlockSuccessTimeout",
+        "uiautomator2ServerInstallTimeout", "uiautomator2ServerLaunchTimeout", "uiautomator2ServerReadTimeout",
+        "remoteAppsCacheLimit", "userProfile"
+    ),
+    list: ("chromedriverArgs", "chromedriverPorts", "logcatFilterSpecs"),
+    dict: ("avdEnv", "chromeOptions", "chromeLoggingPrefs")
+}
+
+CAPABILITY_TYPES = {name: value_type for value_type, names in CAPABILITY_TABLE.items() for name in names}
+
+class CapabilityOptions(AppiumOptions):
+    """AppiumOptions whose load_capabilities checks value types against CAPABILITY_TABLE"""
+
+    @property
+    def default_capabilities(self):
+        return {"appium:automationName": "UIAutomator2", "platformName": "Android"}
+
+    def load_capabilities(self, caps):
+        for name, value in caps.items():
+            check_capability(name, value)
+        return super().load_capabilities(caps)
+
+def check_capability(name, value):
+    """Raise TypeError for a value of the wrong type; names missing from the table are only warned about"""
+    # Standard W3C names and vendor-prefixed ones ("appium:...", "goog:...") are passed through as-is
+    if name in AppiumOptions.W3C_CAPABILITY_NAMES or ":" in name:
+        return
+    if name not in CAPABILITY_TYPES:
+        # The table doesn't list every UiAutomator2 capability, so send it as appium:<name> unchecked
+        print(f"Capability '{name}' is not in CAPABILITY_TABLE, sending it unchecked")
+        return
+    expected = CAPABILITY_TYPES[name]
+    # bool is an int subclass, so True must not pass for a port or timeout
+    if value is not None and (not isinstance(value, expected) or (expected is int and isinstance(value, bool))):
+        raise TypeError(f"Capability '{name}' expects {expected.__name__}, got {type(value).__name__}")
+
+def build_options(capabilities):
+    """Session options for a capabilities dict, the same as UiAutomator2Options().load_capabilities(capabilities)"""
+    return CapabilityOptions().load_capabilities(capabilities)
@@ -0,0 +1,88 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import contextvars
+import functools
+import threading
+
+POOL_SIZE = 8
+# Shared by every driver in the process, so fleet runs can batch on all devices at once
+WORKERS = 32
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def get_executor():
+    """Shared worker threads for fanning out commands"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="batch")
+        return _executor
+
+def enable_parallel_connections(driver, pool_size=POOL_SIZE):
+    """Let the driver keep pool_size keep-alive connections to the server instead of one"""
+    pool = getattr(driver.command_executor, "_conn", None)
+    if pool is None:
+        return driver
+    if pool.connection_pool_kw.get("maxsize") != pool_size:
+        pool.connection_pool_kw["maxsize"] = pool_size
+        # Extra workers wait for a free connection rather than opening throwaway ones
+        pool.connection_pool_kw["block"] = True
+        # Existing per-host pools were built with maxsize=1; drop them so the next request rebuilds them
+        pool.clear()
+    return driver
+
+class CommandBatch:
+    """Independent read commands sent in parallel, with results gathered in submission order"""
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.futures = []
+        self.results = []
+
+    def submit(self, func, *args, **kwargs):
+        """Queue a command, e.g. batch.submit(element.get_attribute, 'text'); returns its future"""
+        # Run it in a copy of the caller's context so context variables (e.g. the traced step) carry over
+        future = self.executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+        self.futures.append(future)
+        return future
+
+    def gather(self):
+        """Wait for every queued command; raises the first error after all have finished"""
+        results = []
+        error = None
+        for future in self.futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(None)
+                error = error or e
+        self.results = results
+        if error:
+            raise error
+        return results
+
+@contextmanager
+def batch(driver):
+    """Fan out independent commands over pooled connections and collect the results in order
+
+    with batch(driver) as commands:
+        for comment in comments:
+            commands.submit(comment.get_attribute, 'text')
+    texts = commands.results
+    """
+    enable_parallel_connections(driver)
+    commands = CommandBatch(get_executor())
+    try:
+        yield commands
+    except Exception:
+        for future in commands.futures:
+            future.cancel()
+        raise
+    commands.gather()
+
+def install(driver):
+    """Give the driver a driver.batch() context manager"""
+    enable_parallel_connections(driver)
+    driver.batch = functools.partial(batch, driver)
+    return driver
@@ -0,0 +1,172 @@
+from contextlib import contextmanager
+import atexit
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+
+# Set AUTOMATION_TRACE=trace.json to record every WebDriver command of a run
+TRACE_FILE = os.environ.get("AUTOMATION_TRACE")
+
+class CommandTracer:
+    """Records each WebDriver command with its timings and rolls them up per script step"""
+
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        # A context variable rather than thread-local, so commands that driver.batch() hands to worker
+        # threads (which run in a copy of the submitting context) stay under the step that submitted them
+        self.steps = contextvars.ContextVar(f"command_tracer_steps_{id(self)}", default=())
+        self.origin = time.perf_counter()
+
+    def _now_us(self):
+        return (time.perf_counter() - self.origin) * 1_000_000
+
+    def current_step(self):
+        steps = self.steps.get()
+        return steps[-1] if steps else None
+
+    def _add(self, event):
+        event["pid"] = os.getpid()
+        event["tid"] = threading.get_ident()
+        with self.lock:
+            self.events.append(event)
+
+    @contextmanager
+    def step(self, name):
+        """Group the commands sent inside the block under a script step"""
+        parent = self.current_step()
+        token = self.steps.set(self.steps.get() + (name,))
+        started = self._now_us()
+        try:
+            yield
+        finally:
+            self.steps.reset(token)
+            self._add({"name": name, "cat": "step", "ph": "X", "ts": started,
+                       "dur": self._now_us() - started, "args": {"parent": parent}})
+
+    def attach(self, driver):
+        """Start tracing the driver's RemoteConnection; safe to call again on a reused session
+
+        Network time is taken around RemoteConnection._send_request, which every request goes through
+        whether it uses the keep-alive pool or, with keep_alive off, a one-off connection.
+        """
+        connection = driver.command_executor
+        if getattr(connection, "_command_tracer", None) is self:
+            return driver
+        connection._command_tracer = self
+        execute = connection.execute
+        request = connection._request
+        send_request = connection._send_request
+
+        def traced_execute(command, params):
+            call = {"command": command, "network": [], "payload": 0, "response": 0, "url": None, "retries": 0}
+            self.local.call = call
+            started = self._now_us()
+            try:
+                return execute(command, params)
+            finally:
+                ended = self._now_us()
+                self.local.call = None
+                network = call["network"]
+                server = sum(end - start for start, end in network)
+                serialize = (network[0][0] - started) if network else 0
+                deserialize = (ended - network[-1][1]) if network else 0
+                self._add({"name": command, "cat": "command", "ph": "X", "ts": started, "dur": ended - started,
+                           "args": {"step": self.current_step(), "url": call["url"],
+                                    "payload_bytes": call["payload"], "response_bytes": call["response"],
+                                    "server_us": server, "serialize_us": serialize,
+                                    "deserialize_us": deserialize, "retries": call["retries"],
+                                    "redirects": max(0, len(network) - 1)}})
+
+        def traced_request(method, url, body=None):
+            call = getattr(self.local, "call", None)
+            if call is not None and call["url"] is None:
+                call["url"] = url
+                call["payload"] = len(body) if body else 0
+            return request(method, url, body=body)
+
+        def traced_send_request(*args, **kwargs):
+            started = self._now_us()
+            response = send_request(*args, **kwargs)
+            call = getattr(self.local, "call", None)
+            if call is not None:
+                call["network"].append((started, self._now_us()))
+                call["response"] += len(response.data or b"")
+                # urllib3 keeps the attempts it retried (connection errors, redirects) on the response
+                retries = getattr(response, "retries", None)
+                call["retries"] += len(retries.history) if retries is not None else 0
+            return response
+
+        connection.execute = traced_execute
+        connection._request = traced_request
+        connection._send_request = traced_send_request
+        return driver
+
+    def rollup(self):
+        """Total time per step and per command within each step, in milliseconds"""
+        with self.lock:
+            events = list(self.events)
+        steps = {}
+        for event in events:
+            if event["cat"] != "command":
+                continue
+            step = steps.setdefault(event["args"]["step"] or "(no step)", {"total": 0, "count": 0, "commands": {}})
+            step["total"] += event["dur"] / 1000
+            step["count"] += 1
+            command = step["commands"].setdefault(event["name"], {"total": 0, "count": 0, "server": 0})
+            command["total"] += event["dur"] / 1000
+            command["count"] += 1
+            command["server"] += event["args"]["server_us"] / 1000
+        return steps
+
+    def print_report(self, width=40):
+        """Print a flamegraph-style breakdown: steps by time, then the commands inside each"""
+        steps = self.rollup()
+        if not steps:
+            return
+        longest = max(step["total"] for step in steps.values()) or 1
+        print("\nCommand trace (ms):")
+        for name, step in sorted(steps.items(), key=lambda item: -item[1]["total"]):
+            bar = "#" * max(1, int(width * step["total"] / longest))
+            print(f"{step['total']:9.1f} {bar} {name} ({step['count']} commands)")
+            for command_name, command in sorted(step["commands"].items(), key=lambda item: -item[1]["total"]):
+                bar = "=" * max(1, int(width * command["total"] / longest))
+                print(f"{command['total']:9.1f}   {bar} {command_name} x{command['count']}"
+                      f" (server {command['server']:.1f})")
+
+    def export(self, path):
+        """Write the events as Chrome trace-event JSON (open in chrome://tracing or Perfetto)"""
+        with self.lock:
+            events = list(self.events)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+tracer = CommandTracer()
+
+def traced_step(func):
+    """Record the commands a step function sends under the function's name"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not TRACE_FILE:
+            return func(*args, **kwargs)
+        with tracer.step(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+def attach(driver):
+    """Trace the driver when AUTOMATION_TRACE is set"""
+    if TRACE_FILE and driver:
+        tracer.attach(driver)
+    return driver
+
+def _export_at_exit():
+    if TRACE_FILE and tracer.events:
+        tracer.print_report()
+        tracer.export(TRACE_FILE)
+        print(f"Trace written to {TRACE_FILE}")
+
+atexit.register(_export_at_exit)
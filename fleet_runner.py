@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from adb_preflight import get_connected_devices
+import sys
+import time
+
+def run_on_device(task, device_id):
+    """Run the automation task on one device and record how it went"""
+    started = time.perf_counter()
+    try:
+        result = task(device_id)
+        error = None
+    except Exception as e:
+        result = None
+        error = str(e)
+    return {
+        "device": device_id,
+        "success": bool(result),
+        "result": result,
+        "error": error,
+        "duration": time.perf_counter() - started
+    }
+
+def run_fleet(task, devices=None, max_workers=None):
+    """Start one worker per device and run the automation task on all of them at the same time"""
+    if devices is None:
+        devices = get_connected_devices()
+    results = {}
+    if not devices:
+        print("No devices found. Please connect an Android device and try again.")
+        return results
+
+    print(f"Starting {len(devices)} worker(s): {', '.join(devices)}")
+    with ThreadPoolExecutor(max_workers=max_workers or len(devices),
+                            thread_name_prefix="fleet") as executor:
+        futures = {executor.submit(run_on_device, task, device_id): device_id for device_id in devices}
+        for future in as_completed(futures):
+            report = future.result()
+            results[report["device"]] = report
+            status = "OK" if report["success"] else "FAILED"
+            print(f"[{report['device']}] {status} in {report['duration']:.1f}s")
+    return results
+
+def print_fleet_report(results):
+    """Print a per-device summary of a fleet run"""
+    if not results:
+        return
+    print("\nFleet results:")
+    for device_id, report in results.items():
+        status = "OK" if report["success"] else "FAILED"
+        line = f"  {device_id}: {status} ({report['duration']:.1f}s)"
+        if report["error"]:
+            line += f" - {report['error']}"
+        print(line)
+    succeeded = sum(1 for report in results.values() if report["success"])
+    print(f"{succeeded}/{len(results)} devices succeeded")
+
+def get_task(app_name):
+    """Return the automation entry point for the given app"""
+    if app_name == "reddit":
+        from reddit_automation import open_reddit_and_interact
+        return open_reddit_and_interact
+    if app_name == "twitter":
+        from twitter_automation import open_twitter
+        return open_twitter
+    return None
+
+if __name__ == "__main__":
+
+    app_name = sys.argv[1] if len(sys.argv) > 1 else "reddit"
+    task = get_task(app_name)
+    if not task:
+        print(f"Unknown app '{app_name}', use 'reddit' or 'twitter'")
+        sys.exit(1)
+
+    results = run_fleet(task, sys.argv[2:] or None)
+    print_fleet_report(results)
@@ -0,0 +1,77 @@
+from selenium.common.exceptions import UnknownMethodException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+from locator_optimizer import optimize_locator
+from server_wait import EXECUTE_DRIVER, IMPLICIT, SCRIPT_MARGIN_MS, server_wait_method
+import json
+
+# Drop-in replacements for expected_conditions that find the element and check its state in one
+# execute_driver request per poll, instead of find_element + is_displayed + is_enabled. Servers that
+# can't run scripts get the classic expected condition. presence_of_element_located is already a
+# single find per poll, so it is not replaced.
+
+CHECK_SCRIPT = """
+const found = await driver.findElements({using}, {value});
+if (!found.length) {{
+    return null;
+}}
+const element = found[0];
+const id = element["element-6066-11e4-a52e-4f735466cecf"] || element.ELEMENT;
+{checks}
+return element;
+"""
+
+# TEXT is replaced with the expected text as a JavaScript string
+CHECKS = {
+    "displayed": "if (!(await driver.isElementDisplayed(id))) { return null; }",
+    "enabled": "if (!(await driver.isElementEnabled(id))) { return null; }",
+    "text": "if (!((await driver.getElementText(id)) || \"\").includes(TEXT)) { return null; }"
+}
+
+# A single check should take far less than this; it only bounds a hung server
+CHECK_TIMEOUT_MS = 1000
+
+def check_script(locator, checks, text=None):
+    """WebdriverIO script returning the first match when every check passes, otherwise null"""
+    by, value = optimize_locator(*locator)
+    lines = "\n".join(CHECKS[check].replace("TEXT", json.dumps(text)) for check in checks)
+    return CHECK_SCRIPT.format(using=json.dumps(by), value=json.dumps(value), checks=lines)
+
+def server_condition(locator, checks, fallback, text=None, resolve=True):
+    """Condition that finds the element and runs checks on it in one request per poll
+
+    Falls back to the classic expected condition when the server can't run execute_driver scripts.
+    """
+    script = check_script(locator, checks, text)
+
+    def _predicate(driver):
+        if server_wait_method(driver) == EXECUTE_DRIVER:
+            try:
+                element = driver.execute_driver(script, timeout_ms=CHECK_TIMEOUT_MS + SCRIPT_MARGIN_MS).result
+            except WebDriverException as e:
+                if not isinstance(e, UnknownMethodException):
+                    print(f"Can't check elements with execute_driver, using separate commands instead: {e}")
+                driver._server_wait_method = IMPLICIT
+            else:
+                if not element:
+                    return False
+                return element if resolve else True
+        return fallback(driver)
+
+    return _predicate
+
+def presence_of_element_located(locator):
+    """EC.presence_of_element_located, which is already one find per poll"""
+    return EC.presence_of_element_located(locator)
+
+def visibility_of_element_located(locator):
+    """Fused EC.visibility_of_element_located"""
+    return server_condition(locator, ("displayed",), EC.visibility_of_element_located(locator))
+
+def element_to_be_clickable(locator):
+    """Fused EC.element_to_be_clickable: present, displayed and enabled in one request"""
+    return server_condition(locator, ("displayed", "enabled"), EC.element_to_be_clickable(locator))
+
+def text_to_be_present_in_element(locator, text_):
+    """Fused EC.text_to_be_present_in_element; returns True like the original"""
+    return server_condition(locator, ("text",), EC.text_to_be_present_in_element(locator, text_),
+                            text=text_, resolve=False)
@@ -0,0 +1,206 @@
+from collections import OrderedDict
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
+import threading
+
+FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+
+# Commands that only read the screen or the session. Anything else (click, send_keys, back, gestures,
+# scripts, app and activity switches) may change what is on screen and clears the cache.
+READ_COMMANDS = FIND_COMMANDS | {
+    "getElementText", "getElementAttribute", "getElementProperty", "getElementTagName", "getElementRect",
+    "isElementDisplayed", "isElementEnabled", "isElementSelected", "getElementValueOfCssProperty",
+    "elementScreenshot", "screenshot", "getPageSource", "getCurrentActivity", "getCurrentPackage",
+    "getContexts", "getCurrentContext", "getSettings", "updateSettings", "getTimeouts", "setTimeouts",
+    "getStatus", "getWindowRect", "getLog", "getAvailableLogTypes",
+    "mobile: getCurrentActivity", "mobile: getCurrentPackage", "mobile: getDeviceInfo", "mobile: getContexts"
+}
+
+# Lookups that report the current screen, so a different answer than last time means it changed
+ACTIVITY_COMMANDS = {
+    "getCurrentActivity", "getCurrentPackage", "mobile: getCurrentActivity", "mobile: getCurrentPackage"
+}
+
+# Asked before the first cached element of each generation is handed out, since the app can move to
+# another screen on its own
+ACTIVITY_SCRIPT = "mobile: getCurrentActivity"
+NATIVE_CONTEXT = "NATIVE_APP"
+# How many found elements remember their locator for stale-element recovery
+MAX_ORIGINS = 512
+
+class LocatorCache:
+    """Element handles found on the current screen, keyed by (context, search root, by, value)"""
+
+    def __init__(self):
+        self.entries = {}
+        self.origins = OrderedDict()
+        self.screen = {}
+        self.context = NATIVE_CONTEXT
+        # Bumped before and after every screen-changing command, so a lookup that overlapped one isn't stored
+        self.generation = 0
+        # Generation the current activity was last looked up in; False once the session can't report it
+        self.checked = None
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0, "recoveries": 0}
+
+    def key(self, command, params):
+        return (self.context, params.get("id"), command, params.get("using"), params.get("value"))
+
+    def invalidate(self):
+        with self.lock:
+            self.generation += 1
+            if self.entries:
+                self.stats["invalidations"] += 1
+            self.entries.clear()
+
+    def lookup(self, command, params):
+        """Cached response value for a find command, or None"""
+        with self.lock:
+            value = self.entries.get(self.key(command, params))
+            self.stats["hits" if value is not None else "misses"] += 1
+        return list(value) if isinstance(value, list) else value
+
+    def store(self, command, params, value, generation):
+        """Keep a find result unless the screen may have changed while it was running"""
+        with self.lock:
+            # Empty results aren't kept: callers poll until the element shows up
+            if generation != self.generation or not value:
+                return
+            self.entries[self.key(command, params)] = list(value) if isinstance(value, list) else value
+            elements = value if isinstance(value, list) else [value]
+            for index, element in enumerate(elements):
+                if isinstance(element, WebElement):
+                    self.origins[element.id] = (command, dict(params), index, element)
+                    self.origins.move_to_end(element.id)
+            while len(self.origins) > MAX_ORIGINS:
+                self.origins.popitem(last=False)
+
+    def remember(self, by, value, element):
+        """Store an element found some other way (e.g. a server-side wait) as if find_element had returned it"""
+        self.store("findElement", {"using": by, "value": value}, element, self.generation)
+
+    def note_screen(self, command, value):
+        """Clear the cache when the current activity or package differs from the last one seen"""
+        with self.lock:
+            previous = self.screen.get(command)
+            self.screen[command] = value
+        if previous is not None and previous != value:
+            self.invalidate()
+
+    def needs_screen_check(self, command, params):
+        """Whether the activity should be looked up before serving this find from cache: only when it would be
+        a hit and the activity hasn't been checked since the last screen-changing command"""
+        with self.lock:
+            if self.checked is False or self.checked == self.generation or self.context != NATIVE_CONTEXT:
+                return False
+            return self.key(command, params) in self.entries
+
+    def check_screen(self, execute):
+        """Look up the current activity, clearing the cache if the app changed screens without being asked"""
+        try:
+            activity = execute("w3cExecuteScript", {"script": ACTIVITY_SCRIPT, "args": []})["value"]
+        except WebDriverException:
+            # Not an Android session: rely on invalidation by commands alone
+            self.checked = False
+            return
+        self.note_screen(ACTIVITY_SCRIPT, activity)
+        self.checked = self.generation
+
+    def lookup_on_screen(self, command, params, execute):
+        """Like lookup, but checks the activity once per generation before the first hit is served"""
+        if self.needs_screen_check(command, params):
+            self.check_screen(execute)
+        return self.lookup(command, params)
+
+    def origin(self, element_id):
+        with self.lock:
+            return self.origins.get(element_id)
+
+def command_name(driver_command, params):
+    """The command, or for execute_script("mobile: ...") the mobile extension, so both can be told apart"""
+    if driver_command == "w3cExecuteScript" and str(params.get("script", "")).startswith("mobile:"):
+        return params["script"]
+    return driver_command
+
+def cached_execute(driver, cache, execute):
+    """Wrap driver.execute so repeated lookups are served from cache and stale handles are re-resolved once"""
+
+    def execute_with_cache(driver_command, params=None):
+        params = params or {}
+        if driver_command in FIND_COMMANDS:
+            value = cache.lookup_on_screen(driver_command, params, execute)
+            if value is not None:
+                return {"value": value, "sessionId": driver.session_id}
+            generation = cache.generation
+            response = execute(driver_command, params)
+            cache.store(driver_command, params, response["value"], generation)
+            return response
+
+        name = command_name(driver_command, params)
+        if name in READ_COMMANDS:
+            response = run_with_recovery(driver_command, params)
+            if name in ACTIVITY_COMMANDS:
+                cache.note_screen(name, response["value"])
+            return response
+
+        cache.invalidate()
+        try:
+            return run_with_recovery(driver_command, params)
+        finally:
+            if driver_command == "switchToContext":
+                cache.context = params.get("name") or NATIVE_CONTEXT
+            cache.invalidate()
+
+    def run_with_recovery(driver_command, params):
+        try:
+            return execute(driver_command, params)
+        except StaleElementReferenceException:
+            element = refind(params.get("id"))
+            if element is None:
+                raise
+            retry_params = dict(params)
+            retry_params["id"] = element.id
+            return execute(driver_command, retry_params)
+
+    def refind(element_id):
+        """Look the stale element up again with the locator it was found by; None when that isn't possible"""
+        origin = cache.origin(element_id)
+        if origin is None:
+            return None
+        command, params, index, element = origin
+        try:
+            found = execute(command, dict(params))["value"]
+        except Exception:
+            return None
+        found = found if isinstance(found, list) else [found]
+        if len(found) <= index:
+            return None
+        # Point the caller's handle at the new element so later commands on it work too
+        element._id = found[index].id
+        cache.stats["recoveries"] += 1
+        return element
+
+    return execute_with_cache
+
+def install(driver):
+    """Serve repeat find_element(s) calls from a per-screen cache; safe to call again on a reused session"""
+    if getattr(driver, "locator_cache", None) is not None:
+        return driver
+    driver.locator_cache = LocatorCache()
+    driver.execute = cached_execute(driver, driver.locator_cache, driver.execute)
+    return driver
+
+def cached_element(driver, by, value):
+    """The element a previous find_element(by, value) returned on the current screen, or None"""
+    cache = getattr(driver, "locator_cache", None)
+    if cache is None:
+        return None
+    by, value = driver.locator_converter.convert(by, value)
+    return cache.lookup_on_screen("findElement", {"using": by, "value": value}, driver.execute)
+
+def remember(driver, by, value, element):
+    """Cache an element located without find_element, such as by a server-side wait"""
+    cache = getattr(driver, "locator_cache", None)
+    if cache is not None and element is not None:
+        by, value = driver.locator_converter.convert(by, value)
+        cache.remember(by, value, element)
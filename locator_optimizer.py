@@ -0,0 +1,157 @@
+from appium.webdriver.common.appiumby import AppiumBy
+from page_snapshot import parse_xpath, mask_quotes, UnsupportedLocator
+import re
+import threading
+import time
+
+# XPath attribute conditions and the UiSelector methods that express them
+UISELECTOR_METHODS = {
+    ("eq", "resource-id"): "resourceId",
+    ("eq", "text"): "text",
+    ("contains", "text"): "textContains",
+    ("starts-with", "text"): "textStartsWith",
+    ("eq", "content-desc"): "description",
+    ("contains", "content-desc"): "descriptionContains",
+    ("starts-with", "content-desc"): "descriptionStartsWith",
+    ("eq", "class"): "className",
+    ("eq", "package"): "packageName"
+}
+
+# The only XPath functions with an exact UiSelector counterpart
+REWRITABLE_FUNCTIONS = {"contains", "starts-with"}
+FUNCTION_CALL = re.compile(r"([\w-]+)\s*\(")
+OR_OPERATOR = re.compile(r"(?<![\w@-])or(?![\w-])")
+
+FIND_COMMANDS = {"findElement", "findElements"}
+CHILD_FIND_COMMANDS = {"findChildElement", "findChildElements"}
+
+def is_rewritable(xpath):
+    """Whether the XPath's predicates only use conditions UiSelector can express exactly"""
+    try:
+        masked = mask_quotes(xpath)
+    except UnsupportedLocator:
+        return False
+    if OR_OPERATOR.search(masked):
+        return False
+    return all(name in REWRITABLE_FUNCTIONS for name in FUNCTION_CALL.findall(masked))
+
+def java_string(value):
+    """Quote a value as a Java string literal for a UiSelector expression"""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def rewrite_xpath(xpath, from_element=False):
+    """Rewrite a single-step XPath into an ID/accessibility id/class/UiAutomator locator, or None if it can't be
+
+    from_element: the lookup is made from an element. UiSelector lookups from an element only search
+    inside it, so an absolute //X (which XPath evaluates against the whole document) is left alone.
+    """
+    if not is_rewritable(xpath):
+        return None
+    try:
+        steps = parse_xpath(xpath)
+    except UnsupportedLocator:
+        return None
+    # A leading '.' step only anchors the search at the element, which UiSelector lookups already do
+    if len(steps) == 2 and steps[0][0] == "self":
+        steps = steps[1:]
+    elif from_element:
+        return None
+    if len(steps) != 1:
+        return None
+    axis, name, predicates, _ = steps[0]
+    if axis != "descendant":
+        return None
+
+    conditions = []
+    for terms in predicates:
+        for kind, args in terms:
+            method = UISELECTOR_METHODS.get((kind, args[0])) if kind != "index" and args else None
+            if not method:
+                # Positions, != and attribute-exists checks have no exact UiSelector equivalent
+                return None
+            conditions.append((kind, args[0], args[1], method))
+
+    if not conditions:
+        if name == "*":
+            return None
+        return AppiumBy.CLASS_NAME, name
+    if name == "*" and len(conditions) == 1:
+        kind, attribute, value, _ = conditions[0]
+        if kind == "eq" and attribute == "resource-id" and ":id/" in value:
+            return AppiumBy.ID, value
+        if kind == "eq" and attribute == "content-desc":
+            return AppiumBy.ACCESSIBILITY_ID, value
+
+    selector = "new UiSelector()"
+    if name != "*":
+        selector += f".className({java_string(name)})"
+    for _, _, value, method in conditions:
+        selector += f".{method}({java_string(value)})"
+    return AppiumBy.ANDROID_UIAUTOMATOR, selector
+
+class LocatorRewriter:
+    """Remembers the rewrite of every XPath seen, separately for driver and element lookups"""
+
+    def __init__(self):
+        self.rewrites = {}
+        self.lock = threading.Lock()
+
+    def rewrite(self, xpath, from_element=False):
+        key = (xpath, from_element)
+        with self.lock:
+            if key not in self.rewrites:
+                self.rewrites[key] = rewrite_xpath(xpath, from_element)
+            return self.rewrites[key]
+
+def optimize_locator(by, value, from_element=False):
+    """Return the faster equivalent of a locator, or the locator itself"""
+    if by == AppiumBy.XPATH:
+        return rewrite_xpath(value, from_element) or (by, value)
+    return by, value
+
+def install(driver):
+    """Make every find_element/find_elements on the driver and its elements send rewritten locators
+
+    The rewrite happens per command rather than in the locator converter, because only the command
+    tells a lookup from the driver apart from one inside an element. Safe to call again on a reused session.
+    """
+    if getattr(driver, "locator_rewriter", None) is not None:
+        return driver
+    rewriter = driver.locator_rewriter = LocatorRewriter()
+    execute = driver.execute
+
+    def execute_with_rewrites(driver_command, params=None):
+        if params and params.get("using") == AppiumBy.XPATH and driver_command in FIND_COMMANDS | CHILD_FIND_COMMANDS:
+            rewritten = rewriter.rewrite(params["value"], from_element=driver_command in CHILD_FIND_COMMANDS)
+            if rewritten:
+                params = dict(params, using=rewritten[0], value=rewritten[1])
+        return execute(driver_command, params)
+
+    driver.execute = execute_with_rewrites
+    return driver
+
+def time_lookup(driver, by, value, repeat):
+    """Average seconds per find_elements call for a locator"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        driver.execute("findElements", {"using": by, "value": value})
+    return (time.perf_counter() - started) / repeat
+
+def measure_savings(driver, xpaths, repeat=3):
+    """Time each XPath against its rewrite on the live screen and print the latency saved"""
+    report = []
+    for xpath in xpaths:
+        rewritten = rewrite_xpath(xpath)
+        if not rewritten:
+            print(f"  (kept XPath) {xpath}")
+            continue
+        try:
+            xpath_time = time_lookup(driver, AppiumBy.XPATH, xpath, repeat)
+            rewritten_time = time_lookup(driver, rewritten[0], rewritten[1], repeat)
+        except Exception as e:
+            print(f"Error timing locator {xpath}: {e}")
+            continue
+        saved = xpath_time - rewritten_time
+        report.append((xpath, rewritten, xpath_time, rewritten_time))
+        print(f"  {saved * 1000:7.1f} ms saved  {xpath} -> {rewritten[0]}: {rewritten[1]}")
+    return report
@@ -0,0 +1,376 @@
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import TimeoutException
+from adaptive_wait import adaptive_wait
+import re
+import xml.etree.ElementTree as ET
+
+BOUNDS_PATTERN = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+# A step's name can't start with '.', so '..' (parent) is told apart from class names like android.widget.Button
+STEP_PATTERN = re.compile(r"(//|/)?([\w*-][\w.*-]*|\.\.|\.)")
+# A quoted value, which can't contain its own quote character
+QUOTED = r"""(?:'([^']*)'|"([^"]*)")"""
+TERM_PATTERNS = [
+    ("eq", re.compile(rf"^@([\w:-]+)\s*=\s*{QUOTED}$")),
+    ("ne", re.compile(rf"^@([\w:-]+)\s*!=\s*{QUOTED}$")),
+    ("text", re.compile(rf"^()text\(\)\s*=\s*{QUOTED}$")),
+    ("contains", re.compile(rf"^contains\(\s*@([\w:-]+)\s*,\s*{QUOTED}\s*\)$")),
+    ("starts-with", re.compile(rf"^starts-with\(\s*@([\w:-]+)\s*,\s*{QUOTED}\s*\)$")),
+    ("has", re.compile(r"^@([\w:-]+)$")),
+    ("index", re.compile(r"^(\d+)$")),
+    ("last", re.compile(r"^last\(\)$"))
+]
+
+# Attributes that get a value -> nodes index for fast lookups
+INDEXED_ATTRIBUTES = ["resource-id", "content-desc", "text"]
+
+class UnsupportedLocator(ValueError):
+    """The locator uses XPath the snapshot evaluator does not implement; look it up on the server instead"""
+
+def parse_bounds(bounds):
+    """Turn a UiAutomator2 bounds string like '[0,10][100,200]' into (left, top, right, bottom)"""
+    match = BOUNDS_PATTERN.match(bounds or "")
+    if not match:
+        return None
+    return tuple(int(value) for value in match.groups())
+
+class SnapshotNode:
+    """One element of a page-source snapshot"""
+
+    __slots__ = ("tag", "attrs", "parent", "children", "order")
+
+    def __init__(self, tag, attrs, parent, order):
+        self.tag = tag
+        self.attrs = attrs
+        self.parent = parent
+        self.children = []
+        self.order = order
+
+    def get(self, name, default=None):
+        return self.attrs.get(name, default)
+
+    @property
+    def text(self):
+        return self.attrs.get("text")
+
+    @property
+    def resource_id(self):
+        return self.attrs.get("resource-id")
+
+    @property
+    def content_desc(self):
+        return self.attrs.get("content-desc")
+
+    @property
+    def bounds(self):
+        return parse_bounds(self.attrs.get("bounds"))
+
+    @property
+    def center(self):
+        """Point to tap the element at"""
+        bounds = self.bounds
+        if not bounds:
+            return None
+        return ((bounds[0] + bounds[2]) // 2, (bounds[1] + bounds[3]) // 2)
+
+    @property
+    def is_displayed(self):
+        return self.attrs.get("displayed", "true") == "true"
+
+    @property
+    def is_enabled(self):
+        return self.attrs.get("enabled", "true") == "true"
+
+    def iter_descendants(self):
+        """Yield every node below this one in document order"""
+        stack = list(reversed(self.children))
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def find_all(self, xpath):
+        """Evaluate an XPath relative to this node"""
+        return evaluate(self, xpath)
+
+    def find(self, xpath):
+        """First match of an XPath relative to this node, or None"""
+        matches = evaluate(self, xpath)
+        return matches[0] if matches else None
+
+    def record(self):
+        """Structured dict of the node's locator-relevant attributes"""
+        return {
+            "class": self.tag,
+            "text": self.text,
+            "resource_id": self.resource_id,
+            "content_desc": self.content_desc,
+            "enabled": self.is_enabled,
+            "displayed": self.is_displayed,
+            "bounds": self.bounds,
+            "center": self.center
+        }
+
+    def __repr__(self):
+        return f"<SnapshotNode {self.tag} {self.resource_id or self.content_desc or self.text or ''}>"
+
+class PageSnapshot:
+    """Page source parsed once into an indexed tree, so locators can be evaluated without round trips"""
+
+    def __init__(self, page_source):
+        root = ET.fromstring(page_source.encode('utf-8') if isinstance(page_source, str) else page_source)
+        self.nodes = []
+        self.by_class = {}
+        self.indexes = {name: {} for name in INDEXED_ATTRIBUTES}
+        self.root = self._build(root, None)
+
+    @classmethod
+    def from_driver(cls, driver):
+        """Take a snapshot of the driver's current screen with a single page_source call"""
+        return cls(driver.page_source)
+
+    def _build(self, element, parent):
+        # Iterative so deep hierarchies don't hit the recursion limit
+        root = None
+        stack = [(element, parent)]
+        while stack:
+            element, parent = stack.pop()
+            node = SnapshotNode(element.tag, dict(element.attrib), parent, len(self.nodes))
+            self.nodes.append(node)
+            if parent is None:
+                root = node
+            else:
+                parent.children.append(node)
+            self.by_class.setdefault(node.tag, []).append(node)
+            for name, index in self.indexes.items():
+                value = node.attrs.get(name)
+                if value:
+                    index.setdefault(value, []).append(node)
+            stack.extend((child, node) for child in reversed(element))
+        return root
+
+    def find_all(self, by, value):
+        """All nodes matching an AppiumBy locator, in document order"""
+        if by == AppiumBy.ID:
+            matches = self.indexes["resource-id"].get(value, [])
+            if not matches and ":id/" not in value:
+                # Appium accepts bare ids and matches them against any package
+                matches = [n for key, nodes in self.indexes["resource-id"].items()
+                           if key.endswith(f":id/{value}") for n in nodes]
+                matches.sort(key=lambda n: n.order)
+            return list(matches)
+        if by == AppiumBy.ACCESSIBILITY_ID:
+            return list(self.indexes["content-desc"].get(value, []))
+        if by == AppiumBy.CLASS_NAME:
+            return list(self.by_class.get(value, []))
+        if by == AppiumBy.XPATH:
+            return evaluate(self.root, value, self)
+        raise UnsupportedLocator(f"Unsupported locator strategy: {by}")
+
+    def find(self, by, value):
+        """First node matching an AppiumBy locator, or None"""
+        matches = self.find_all(by, value)
+        return matches[0] if matches else None
+
+def mask_quotes(text):
+    """text with the inside of every quoted value blanked out, so operators and brackets are only found outside values"""
+    masked = []
+    quote = None
+    for char in text:
+        if quote:
+            masked.append(char if char == quote else "_")
+            if char == quote:
+                quote = None
+        else:
+            if char in "'\"":
+                quote = char
+            masked.append(char)
+    if quote:
+        raise UnsupportedLocator(f"Unbalanced quotes in XPath: {text}")
+    return "".join(masked)
+
+def parse_predicate(text):
+    """Parse one [..] predicate into a list of (kind, args) terms joined by 'and'"""
+    masked = mask_quotes(text)
+    if re.search(r"(?<![\w@-])or(?![\w-])", masked):
+        raise UnsupportedLocator(f"Unsupported XPath predicate ('or'): [{text}]")
+    parts = []
+    start = 0
+    for separator in re.finditer(r"\s+and\s+", masked):
+        parts.append(text[start:separator.start()])
+        start = separator.end()
+    parts.append(text[start:])
+
+    terms = []
+    for part in parts:
+        part = part.strip()
+        for kind, pattern in TERM_PATTERNS:
+            match = pattern.match(part)
+            if match:
+                groups = match.groups()
+                if kind in ("eq", "ne", "contains", "starts-with"):
+                    terms.append((kind, (groups[0], quoted_value(groups))))
+                elif kind == "text":
+                    terms.append(("eq", ("text", quoted_value(groups))))
+                elif kind == "has":
+                    terms.append((kind, (groups[0],)))
+                elif kind == "index":
+                    terms.append((kind, (int(groups[0]),)))
+                else:
+                    terms.append((kind, ()))
+                break
+        else:
+            raise UnsupportedLocator(f"Unsupported XPath predicate: [{text}]")
+    return terms
+
+def quoted_value(groups):
+    """The value of a QUOTED match, whichever quote character it used"""
+    single, double = groups[-2:]
+    return single if single is not None else double
+
+def split_predicates(xpath, masked, position):
+    """Read consecutive [..] predicates starting at position; returns their contents and the end position"""
+    predicates = []
+    while position < len(masked) and masked[position] == "[":
+        depth = 0
+        for end in range(position, len(masked)):
+            if masked[end] == "[":
+                depth += 1
+            elif masked[end] == "]":
+                depth -= 1
+                if depth == 0:
+                    break
+        else:
+            raise UnsupportedLocator(f"Unbalanced brackets in XPath: {xpath}")
+        predicates.append(xpath[position + 1:end])
+        position = end + 1
+    return predicates, position
+
+def parse_xpath(xpath):
+    """Split an XPath into (axis, name, predicates) steps"""
+    xpath = xpath.strip()
+    masked = mask_quotes(xpath)
+    steps = []
+    position = 0
+    while position < len(xpath):
+        match = STEP_PATTERN.match(masked, position)
+        if not match or match.end() == position:
+            raise UnsupportedLocator(f"Unsupported XPath: {xpath}")
+        separator, name = match.groups()
+        if not separator and position > 0:
+            raise UnsupportedLocator(f"Unsupported XPath: {xpath}")
+        if name == "..":
+            raise UnsupportedLocator(f"Unsupported XPath ('..'): {xpath}")
+        axis = "descendant" if separator == "//" else "child"
+        if not separator:
+            axis = "self" if name == "." else "child"
+        predicates, end = split_predicates(xpath, masked, match.end())
+        predicate_terms = [parse_predicate(p) for p in predicates]
+        steps.append((axis, name, predicate_terms, position == 0 and bool(separator)))
+        position = end
+    return steps
+
+def matches_term(node, kind, args):
+    if kind == "eq":
+        return node.attrs.get(args[0]) == args[1]
+    if kind == "ne":
+        return node.attrs.get(args[0]) != args[1]
+    if kind == "contains":
+        return args[1] in node.attrs.get(args[0], "")
+    if kind == "starts-with":
+        return node.attrs.get(args[0], "").startswith(args[1])
+    if kind == "has":
+        return args[0] in node.attrs
+    raise UnsupportedLocator(kind)
+
+def apply_predicates(candidates, predicates):
+    for terms in predicates:
+        positional = [t for t in terms if t[0] in ("index", "last")]
+        filters = [t for t in terms if t[0] not in ("index", "last")]
+        if filters:
+            candidates = [n for n in candidates if all(matches_term(n, k, a) for k, a in filters)]
+        if positional:
+            if len(terms) > 1:
+                raise UnsupportedLocator("Positions can't be combined with other conditions")
+            kind, args = positional[0]
+            position = len(candidates) if kind == "last" else args[0]
+            candidates = candidates[position - 1:position] if 0 < position <= len(candidates) else []
+    return candidates
+
+def name_matches(node, name):
+    return name == "*" or node.tag == name
+
+def indexed_candidates(snapshot, name, predicates):
+    """Use the snapshot indexes to narrow a leading //step, or None when they can't help"""
+    if snapshot is None or any(k in ("index", "last") for terms in predicates for k, _ in terms):
+        return None
+    for terms in predicates:
+        for kind, args in terms:
+            # Empty values aren't indexed, so [@text=''] has to scan
+            if kind == "eq" and args[0] in snapshot.indexes and args[1]:
+                return [n for n in snapshot.indexes[args[0]].get(args[1], []) if name_matches(n, name)]
+    if name != "*":
+        return list(snapshot.by_class.get(name, []))
+    return None
+
+def evaluate(context, xpath, snapshot=None):
+    """Evaluate a supported XPath subset against a snapshot node, returning nodes in document order"""
+    steps = parse_xpath(xpath)
+    current = [context]
+    for step_number, (axis, name, predicates, absolute) in enumerate(steps):
+        if absolute:
+            # Absolute paths start from the document, whichever node they were asked from
+            top = context
+            while top.parent is not None:
+                top = top.parent
+            if step_number == 0 and axis == "descendant":
+                indexed = indexed_candidates(snapshot, name, predicates)
+                if indexed is not None:
+                    current = apply_predicates(indexed, predicates)
+                    continue
+            current = [top] if axis == "descendant" else [_document(top)]
+        if axis == "self":
+            continue
+        selected = {}
+        for node in current:
+            parents = [node]
+            if axis == "descendant":
+                parents += list(node.iter_descendants())
+            for parent in parents:
+                children = [c for c in parent.children if name_matches(c, name)]
+                for match in apply_predicates(children, predicates):
+                    selected[match.order] = match
+            if absolute and axis == "descendant" and name_matches(node, name) and node.parent is None:
+                for match in apply_predicates([node], predicates):
+                    selected[match.order] = match
+        current = [selected[order] for order in sorted(selected)]
+    return current
+
+def _document(root):
+    """Stand-in document node whose only child is the hierarchy root"""
+    document = SnapshotNode("#document", {}, None, -1)
+    document.children = [root]
+    return document
+
+def take_snapshot(driver):
+    """Fetch and index the current page source"""
+    return PageSnapshot.from_driver(driver)
+
+def wait_for_snapshot(driver, by, value, timeout=10):
+    """Wait until the locator matches in a fresh snapshot and return that snapshot"""
+    def locate(d):
+        snapshot = PageSnapshot.from_driver(d)
+        return snapshot if snapshot.find_all(by, value) else False
+
+    try:
+        return adaptive_wait(driver, (by, value), timeout).until(locate)
+    except TimeoutException:
+        print(f"Elements not found: {value}")
+        return None
+
+def tap_node(driver, node):
+    """Tap the middle of a snapshot node"""
+    if node is None or not node.center:
+        return False
+    driver.tap([node.center])
+    return True
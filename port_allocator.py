@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+from appium.webdriver.appium_service import is_service_listening
+import socket
+import threading
+
+APPIUM_HOST = "127.0.0.1"
+APPIUM_PORTS = [4723, 4724, 4725, 4726]
+
+# Ranges the UiAutomator2 driver documents for its per-session ports
+PORT_RANGES = {
+    "systemPort": range(8200, 8300),
+    "chromedriverPort": range(9515, 9615),
+    "mjpegServerPort": range(7810, 7910)
+}
+
+def is_port_free(port, host=APPIUM_HOST):
+    """Check that nothing on this host is bound to the port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        try:
+            sock.bind((host, port))
+            return True
+        except OSError:
+            return False
+
+class PortAllocator:
+    """Hands out per-device systemPort/chromedriverPort/mjpegServerPort values that no other session holds
+
+    Every session on a device shares the device's ports, so the lease counts its sessions and the ports
+    are only freed when the last of them is released.
+    """
+
+    def __init__(self, port_ranges=None):
+        self.port_ranges = port_ranges or PORT_RANGES
+        self.leases = {}
+        self.holders = {}
+        self.lock = threading.Lock()
+
+    def lease(self, device_id):
+        """Return the ports leased to the device for one more session, leasing free ones on first use"""
+        with self.lock:
+            if device_id in self.leases:
+                self.holders[device_id] += 1
+                return dict(self.leases[device_id])
+
+            taken = {name: set() for name in self.port_ranges}
+            for ports in self.leases.values():
+                for name, port in ports.items():
+                    taken[name].add(port)
+
+            ports = {}
+            for name, port_range in self.port_ranges.items():
+                port = next((p for p in port_range if p not in taken[name] and is_port_free(p)), None)
+                if port is None:
+                    raise RuntimeError(f"No free {name} left in {port_range.start}-{port_range.stop - 1}")
+                ports[name] = port
+            self.leases[device_id] = ports
+            self.holders[device_id] = 1
+            return dict(ports)
+
+    def adopt(self, device_id, ports):
+        """Count a session another process leased ports for, keeping the ports it already uses"""
+        with self.lock:
+            if device_id in self.leases:
+                self.holders[device_id] += 1
+            else:
+                self.leases[device_id] = dict(ports)
+                self.holders[device_id] = 1
+
+    def leased(self, device_id):
+        """The ports currently leased to the device, or an empty dict"""
+        with self.lock:
+            return dict(self.leases.get(device_id, {}))
+
+    def release(self, device_id):
+        """Release one session's hold on the device's ports, freeing them once no session holds them"""
+        with self.lock:
+            if device_id not in self.leases:
+                return
+            self.holders[device_id] -= 1
+            if self.holders[device_id] <= 0:
+                self.leases.pop(device_id)
+                self.holders.pop(device_id)
+
+_allocator = PortAllocator()
+
+def lease_ports(device_id):
+    """Lease UiAutomator2 session ports for a device from the shared allocator"""
+    return _allocator.lease(device_id)
+
+def release_ports(device_id):
+    """Release one session's ports for the device in the shared allocator"""
+    _allocator.release(device_id)
+
+def adopt_ports(device_id, ports):
+    """Register the ports of a session reattached from another process with the shared allocator"""
+    _allocator.adopt(device_id, ports)
+
+def leased_ports(device_id):
+    """Ports the shared allocator has leased to the device"""
+    return _allocator.leased(device_id)
+
+def find_appium_servers(host=APPIUM_HOST, ports=None, timeout=1.0):
+    """Health-check all candidate Appium ports in parallel and return the live server URLs in port order"""
+    ports = ports or APPIUM_PORTS
+    urls = [f"http://{host}:{port}" for port in ports]
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        alive = list(executor.map(lambda url: is_service_listening(f"{url}/status", timeout=timeout), urls))
+    return [url for url, is_alive in zip(urls, alive) if is_alive]
@@ -1,60 +1,78 @@
 from appium import webdriver
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.support.ui import WebDriverWait 
 from selenium.webdriver.support import expected_conditions as EC
-from appium.options.android import UiAutomator2Options
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-import subprocess
-import time
+from selenium.common.exceptions import TimeoutException
+from adb_preflight import get_connected_devices, preflight, run_preflight
+from fleet_runner import run_fleet, print_fleet_report
+from port_allocator import lease_ports, release_ports, find_appium_servers
+from capability_options import build_options
+from session_pool import session_pool
+from ui_settle import enable_idle_waits, wait_for_idle
+from adaptive_wait import adaptive_wait
+from server_wait import wait_on_server
+from batch_locator import wait_for_children, tap_record
+from page_snapshot import wait_for_snapshot, tap_node
+from fused_conditions import element_to_be_clickable
+from workflow_compiler import run_workflow
+from locator_optimizer import install as install_locator_optimizer
+from locator_cache import install as install_locator_cache
+from command_tracer import traced_step, attach as attach_tracer
+from command_batch import install as install_command_batch
 
-def get_connected_devices():
-    """Get a list of connected Android devices using adb"""
-    try:
-        result = subprocess.run(['adb', 'devices'], capture_output=True, text=True)
-        lines = result.stdout.strip().split('\n')[1:]
-        devices = []
-        for line in lines:
-            if line.strip() and 'device' in line:
-                device_id = line.split('\t')[0]
-                devices.append(device_id)
-        return devices
-    except Exception as e:
-        print(f"Error getting device list: {e}")
-        return []
+APP_PACKAGE = "com.reddit.frontpage"
 
-def verify_app_installed(device_id):
-    """Verify if Reddit app is installed on the device"""
-    try:
-        result = subprocess.run(
-            ['adb', '-s', device_id, 'shell', 'pm', 'list', 'packages', 'com.reddit.frontpage'],
-            capture_output=True,
-            text=True
-        )
-        return 'com.reddit.frontpage' in result.stdout
-    except Exception as e:
-        print(f"Error checking Reddit app installation: {e}")
-        return False
+# Permissions granted to the Reddit app before each session
+PERMISSIONS = [
+    "android.permission.WRITE_EXTERNAL_STORAGE",
+    "android.permission.READ_EXTERNAL_STORAGE",
+    "android.permission.CAMERA",
+    "android.permission.ACCESS_FINE_LOCATION",
+    "android.permission.ACCESS_COARSE_LOCATION"
+]
 
-def grant_permissions(device_id):
-    """Grant necessary permissions to the Reddit app"""
-    permissions = [
-        "android.permission.WRITE_EXTERNAL_STORAGE",
-        "android.permission.READ_EXTERNAL_STORAGE",
-        "android.permission.CAMERA",
-        "android.permission.ACCESS_FINE_LOCATION",
-        "android.permission.ACCESS_COARSE_LOCATION"
-    ]
-    try:
-        for permission in permissions:
-            subprocess.run([
-                'adb', '-s', device_id, 'shell', 
-                'pm', 'grant', 'com.reddit.frontpage', permission
-            ], capture_output=True)
-    except Exception as e:
-        print(f"Error granting permissions: {e}")
+POST_UNIT = "//android.view.View[@resource-id='post_unit']"
+COMMENT = "//android.view.ViewGroup[contains(@content-desc, 'comment by')]"
+
+# Footer buttons of a post, resolved together with the post in one page-source read
+POST_BUTTONS = {
+    "upvote": ".//android.view.View[@resource-id='post_footer']/android.view.View[1]",
+    "comment": ".//android.view.View[@resource-id='post_footer']/android.view.View[@resource-id='post_comment_button']"
+}
+
+JOIN_BUTTON = "//android.widget.Button[contains(@text, 'Join the conversation')]"
+COMMENT_INPUT = "//android.widget.EditText"
+SUBMIT_BUTTON = "//android.widget.Button[contains(@text, 'Post')]"
+COMMENT_TEXT = "This is an automated comment."
+
+AUTHOR = ".//android.widget.TextView[@resource-id='com.reddit.frontpage:id/author']"
+AUTHOR_TARGET = ".//android.view.View[@resource-id='com.reddit.frontpage:id/author_clickable_target']"
+START_CHAT = "//android.widget.LinearLayout[@resource-id='com.reddit.frontpage:id/start_chat']"
+MESSAGE_INPUT = "//android.widget.EditText[@resource-id='text_message_input']"
+SEND_BUTTON = "//android.view.View[@content-desc='Send message']"
+MESSAGE_TEXT = "Hey! How are you doing?"
+# Your own accounts, never messaged
+SKIP_USERS = ['AltruisticDistance56', 'AutoModerator', 'Dependent-Taste-9645', 'Misaboi']
+
+# comment_on_post as one execute_driver script instead of ~9 separate requests
+COMMENT_WORKFLOW = [
+    {"op": "find", "name": "post", "locator": (AppiumBy.XPATH, POST_UNIT)},
+    {"op": "click", "within": "post", "locator": (AppiumBy.XPATH, POST_BUTTONS["comment"])},
+    {"op": "click", "locator": (AppiumBy.XPATH, JOIN_BUTTON), "timeout": 5, "optional": True},
+    {"op": "type", "locator": (AppiumBy.XPATH, COMMENT_INPUT), "text": COMMENT_TEXT},
+    {"op": "click", "locator": (AppiumBy.XPATH, SUBMIT_BUTTON)}
+]
+
+def prepare_driver(driver):
+    """Install the lookup and batching helpers on a new or reattached session"""
+    install_locator_optimizer(driver)
+    install_locator_cache(driver)
+    install_command_batch(driver)
+    return driver
 
 def setup_driver(device_id=None):
     """Set up the Appium driver with enhanced error handling"""
+    driver = None
+    ports = None
     try:
         if not device_id:
             devices = get_connected_devices()
@@ -64,18 +82,17 @@ def setup_driver(device_id=None):
             device_id = devices[0]
 
         
-        if not verify_app_installed(device_id):
+        if not preflight(device_id, APP_PACKAGE, PERMISSIONS):
             print("Reddit app is not installed on the device!")
             return None
 
-       
-        grant_permissions(device_id)
+        ports = lease_ports(device_id)
 
         capabilities = {
             "platformName": "Android",
             "automationName": "UiAutomator2",
             "deviceName": device_id,
-            "appPackage": "com.reddit.frontpage",
+            "appPackage": APP_PACKAGE,
             "appActivity": "com.reddit.launch.main.MainActivity",
             "noReset": True,
             "autoGrantPermissions": True,
@@ -83,7 +100,9 @@ def setup_driver(device_id=None):
             "disableWindowAnimation": True,
             "newCommandTimeout": 6000,
             "androidInstallTimeout": 90000,
-            "systemPort": 8201,
+            "systemPort": ports["systemPort"],
+            "chromedriverPort": ports["chromedriverPort"],
+            "mjpegServerPort": ports["mjpegServerPort"],
             "skipDeviceInitialization": True,
             "skipServerInstallation": False,
             "uiautomator2ServerInstallTimeout": 120000,
@@ -93,41 +112,47 @@ def setup_driver(device_id=None):
             "avdLaunchTimeout": 60000
         }
         
-        options = UiAutomator2Options().load_capabilities(capabilities)
+        options = build_options(capabilities)
                 
-        ports = [4723, 4724, 4725, 4726]
+        servers = find_appium_servers()
+        if not servers:
+            print("No Appium server is listening on ports 4723-4726!")
+            return None
+
         driver = None
-        
-        for port in ports:
+        for server_url in servers:
             try:
-                driver = webdriver.Remote(f'http://127.0.0.1:{port}', options=options)
-                print(f"Successfully connected to Appium server on port {port}")
+                driver = webdriver.Remote(server_url, options=options)
+                print(f"Successfully connected to Appium server at {server_url}")
+                prepare_driver(driver)
                 break
             except Exception as e:
-                print(f"Failed to connect on port {port}: {e}")
+                print(f"Failed to connect to {server_url}: {e}")
+                driver = None
                 continue
-        
+
         return driver
 
     except Exception as e:
         print(f"Error setting up driver: {e}")
         return None
+    finally:
+        # Give the lease back unless a session now uses the ports
+        if ports is not None and driver is None:
+            release_ports(device_id)
 
 def wait_for_element(driver, by, value, timeout=10):
     """Wait for element to be present and return it"""
-    try:
-        wait = WebDriverWait(driver, timeout)
-        element = wait.until(EC.presence_of_element_located((by, value)))
-        return element
-    except TimeoutException:
+    element = wait_on_server(driver, by, value, timeout)
+    if element is None:
         print(f"Element not found: {value}")
-        return None
+    return element
 
 def wait_for_clickable(driver, by, value, timeout=10):
     """Wait for element to be clickable and return it"""
     try:
-        wait = WebDriverWait(driver, timeout)
-        element = wait.until(EC.element_to_be_clickable((by, value)))
+        wait = adaptive_wait(driver, (by, value), timeout)
+        element = wait.until(element_to_be_clickable((by, value)))
         return element
     except TimeoutException:
         print(f"Element not clickable: {value}")
@@ -136,54 +161,63 @@ def wait_for_clickable(driver, by, value, timeout=10):
 def wait_for_elements(driver, by, value, timeout=10):
     """Wait for elements to be present and return them"""
     try:
-        wait = WebDriverWait(driver, timeout)
+        wait = adaptive_wait(driver, (by, value), timeout)
         elements = wait.until(EC.presence_of_all_elements_located((by, value)))
         return elements
     except TimeoutException:
         print(f"Elements not found: {value}")
         return []
 
+@traced_step
 def find_and_upvote_post(driver):
     """Find and upvote the first post"""
     try:
-        first_post = wait_for_element(driver, AppiumBy.XPATH, "//android.view.View[@resource-id='post_unit']")
+        first_post = wait_for_children(driver, POST_UNIT, POST_BUTTONS)
         if first_post:
-            upvote_button = first_post.find_element(AppiumBy.XPATH, 
-                ".//android.view.View[@resource-id='post_footer']/android.view.View[1]")
+            upvote_button = first_post["children"]["upvote"]
             if upvote_button:
-                upvote_button.click()
+                tap_record(driver, upvote_button)
                 print("Upvoted the first post successfully")
                 return True
     except Exception as e:
         print(f"Error upvoting post: {e}")
     return False
 
+@traced_step
 def comment_on_post(driver):
-    """Comment on the first post"""
+    """Comment on the first post, in one round trip when the server can run the whole workflow"""
     try:
-        first_post = wait_for_element(driver, AppiumBy.XPATH, "//android.view.View[@resource-id='post_unit']")
+        if run_workflow(driver, COMMENT_WORKFLOW) is not None:
+            print("Submitted the comment")
+            return True
+    except Exception as e:
+        print(f"Error commenting on post: {e}")
+        return False
+    return comment_on_post_stepwise(driver)
+
+def comment_on_post_stepwise(driver):
+    """Comment on the first post one command at a time"""
+    try:
+        first_post = wait_for_children(driver, POST_UNIT, POST_BUTTONS)
         if first_post:
-            comment_button = first_post.find_element(AppiumBy.XPATH, 
-                ".//android.view.View[@resource-id='post_footer']/android.view.View[@resource-id='post_comment_button']")
+            comment_button = first_post["children"]["comment"]
             if comment_button:
-                comment_button.click()
+                tap_record(driver, comment_button)
                 print("Clicked the comment button on the first post")
-                time.sleep(5)
+                wait_for_idle(driver, timeout=5)
 
-                join_button = wait_for_clickable(driver, AppiumBy.XPATH, 
-                    "//android.widget.Button[contains(@text, 'Join the conversation')]")
+                join_button = wait_for_clickable(driver, AppiumBy.XPATH, JOIN_BUTTON)
                 if join_button:
                     join_button.click()
                     print("Clicked 'Join the conversation' button")
-                    time.sleep(2)
+                    wait_for_idle(driver, timeout=2)
 
-                comment_input = wait_for_element(driver, AppiumBy.XPATH, "//android.widget.EditText")
+                comment_input = wait_for_element(driver, AppiumBy.XPATH, COMMENT_INPUT)
                 if comment_input:
-                    comment_input.send_keys("This is an automated comment.")
+                    comment_input.send_keys(COMMENT_TEXT)
                     print("Typed a comment")
 
-                    submit_button = wait_for_clickable(driver, AppiumBy.XPATH, 
-                        "//android.widget.Button[contains(@text, 'Post')]")
+                    submit_button = wait_for_clickable(driver, AppiumBy.XPATH, SUBMIT_BUTTON)
                     if submit_button:
                         submit_button.click()
                         print("Submitted the comment")
@@ -192,67 +226,64 @@ def comment_on_post(driver):
         print(f"Error commenting on post: {e}")
     return False
 
+@traced_step
 def find_and_message_user(driver):
     """Find a user and send them a message"""
     try:
         
-        time.sleep(3)
+        wait_for_idle(driver, timeout=3)
 
-        comments = wait_for_elements(driver, AppiumBy.XPATH, 
-            "//android.view.ViewGroup[contains(@content-desc, 'comment by')]")
-        if not comments:
+        snapshot = wait_for_snapshot(driver, AppiumBy.XPATH, COMMENT)
+        if not snapshot:
             print("No comments found")
             return False
 
-        skip_users = ['AltruisticDistance56', 'AutoModerator', 'Dependent-Taste-9645', 'Misaboi']#this is to ignore your accounts
-      
-        for comment in comments:
-            try:
-                username = comment.find_element(AppiumBy.XPATH, 
-                    ".//android.widget.TextView[@resource-id='com.reddit.frontpage:id/author']")
-                username_text = username.get_attribute('text')
+        # One page_source read covers every comment and its author fields
+        for comment in snapshot.find_all(AppiumBy.XPATH, COMMENT):
+            username = comment.find(AUTHOR)
+            if username is None:
+                continue
+            username_text = username.text
                 
-                if username_text not in skip_users:
-                    print(f"Found username: {username_text}")
+            if username_text not in SKIP_USERS:
+                print(f"Found username: {username_text}")
                     
-                    username_clickable = comment.find_element(AppiumBy.XPATH, 
-                        ".//android.view.View[@resource-id='com.reddit.frontpage:id/author_clickable_target']")
-                    username_clickable.click()
-                    print("Clicked on username")
+                username_clickable = comment.find(AUTHOR_TARGET)
+                if username_clickable is None:
+                    continue
+                if not tap_node(driver, username_clickable):
+                    print(f"Could not tap {username_text}: the username has no bounds")
+                    continue
+                print("Clicked on username")
                                        
-                    time.sleep(3)
-                    start_chat = wait_for_element(driver, AppiumBy.XPATH,
-                        "//android.widget.LinearLayout[@resource-id='com.reddit.frontpage:id/start_chat']")
-                    if start_chat:
-                        start_chat.click()
-                        print("Clicked Start Chat button")
+                wait_for_idle(driver, timeout=3)
+                start_chat = wait_for_element(driver, AppiumBy.XPATH, START_CHAT)
+                if start_chat:
+                    start_chat.click()
+                    print("Clicked Start Chat button")
                        
-                        time.sleep(3)
+                    wait_for_idle(driver, timeout=3)
                        
-                        message_input = wait_for_element(driver, AppiumBy.XPATH,
-                            "//android.widget.EditText[@resource-id='text_message_input']")
-                        if message_input:
-                            message_input.click()
-                            message_input.send_keys("Hey! How are you doing?")
-                            print("Typed message")
+                    message_input = wait_for_element(driver, AppiumBy.XPATH, MESSAGE_INPUT)
+                    if message_input:
+                        message_input.click()
+                        message_input.send_keys(MESSAGE_TEXT)
+                        print("Typed message")
                         
-                            time.sleep(1)
+                        wait_for_idle(driver, timeout=1)
                            
-                            send_button = wait_for_element(driver, AppiumBy.XPATH,
-                                "//android.view.View[@content-desc='Send message']")
-                            if send_button:
-                                send_button.click()
-                                print("Clicked send button")
+                        send_button = wait_for_element(driver, AppiumBy.XPATH, SEND_BUTTON)
+                        if send_button:
+                            send_button.click()
+                            print("Clicked send button")
                                 
-                                time.sleep(3)
+                            wait_for_idle(driver, timeout=3)
                                 
-                                page_source = driver.page_source
-                                print("\nXML Structure after sending message:")
-                                print(page_source)
-                                return True
-                    break
-            except NoSuchElementException:
-                continue
+                            page_source = driver.page_source
+                            print("\nXML Structure after sending message:")
+                            print(page_source)
+                            return True
+                break
     except Exception as e:
         print(f"Error messaging user: {e}")
     return False
@@ -262,19 +293,21 @@ def open_reddit_and_interact(device_id=None):
     driver = None
     try:
         print("Starting Reddit automation...")
-        driver = setup_driver(device_id)
+        driver = session_pool.acquire(device_id, APP_PACKAGE, setup_driver, prepare_driver)
         if not driver:
             print("Failed to initialize driver")
             return None
+        attach_tracer(driver)
         
         print("Reddit opened successfully")
-        time.sleep(5)  
+        enable_idle_waits(driver)
+        wait_for_idle(driver, timeout=5)  
         
         
         find_and_upvote_post(driver)
-        time.sleep(2)
+        wait_for_idle(driver, timeout=2)
         comment_on_post(driver)
-        time.sleep(2)
+        wait_for_idle(driver, timeout=2)
         find_and_message_user(driver)
         
         return True
@@ -284,8 +317,7 @@ def open_reddit_and_interact(device_id=None):
         return None
     finally:
         if driver:
-            driver.quit()
-            print("Session ended")
+            session_pool.release(device_id, APP_PACKAGE, driver)
 
 if __name__ == "__main__":
     
@@ -297,15 +329,10 @@ if __name__ == "__main__":
         
         
         if len(devices) > 1:
-            try:
-                device_index = int(input("Select device number (or press Enter for first device): ")) - 1
-                selected_device = devices[device_index]
-            except (ValueError, IndexError):
-                print("Invalid selection, using first device")
-                selected_device = devices[0]
+            run_preflight(devices, APP_PACKAGE, PERMISSIONS)
+            results = run_fleet(open_reddit_and_interact, devices)
+            print_fleet_report(results)
         else:
-            selected_device = devices[0]
-            
-        open_reddit_and_interact(selected_device)
+            open_reddit_and_interact(devices[0])
     else:
         print("No devices found. Please connect an Android device and try again.")
\ No newline at end of file
@@ -0,0 +1,94 @@
+from contextlib import contextmanager
+from selenium.common.exceptions import UnknownMethodException, WebDriverException
+from adaptive_wait import locator_stats
+from locator_optimizer import optimize_locator
+from locator_cache import cached_element, remember
+import json
+import time
+
+EXECUTE_DRIVER = "execute_driver"
+IMPLICIT = "implicit"
+
+SERVER_POLL_MS = 100
+# Extra time Appium gets to finish the script after the wait itself has timed out
+SCRIPT_MARGIN_MS = 5000
+
+# Polls findElements inside the Appium server, so the whole wait is one HTTP request
+WAIT_SCRIPT = """
+const deadline = Date.now() + {timeout_ms};
+while (true) {{
+    const found = await driver.findElements({using}, {value});
+    if (found.length) {{
+        return found[0];
+    }}
+    if (Date.now() >= deadline) {{
+        return null;
+    }}
+    await driver.pause({poll_ms});
+}}
+"""
+
+def set_implicit_wait(driver, seconds):
+    """Set the session's implicit wait, skipping the request when it already has that value"""
+    if getattr(driver, "_implicit_wait", 0) != seconds:
+        driver.implicitly_wait(seconds)
+        driver._implicit_wait = seconds
+
+@contextmanager
+def implicit_wait(driver, seconds):
+    """Let find_element(s) inside the block wait on the server for up to seconds, then restore the old value"""
+    previous = getattr(driver, "_implicit_wait", 0)
+    set_implicit_wait(driver, seconds)
+    try:
+        yield driver
+    finally:
+        set_implicit_wait(driver, previous)
+
+def find_with_execute_driver(driver, by, value, timeout):
+    """Wait for the locator with a server-side WebdriverIO loop; returns the element or None"""
+    script = WAIT_SCRIPT.format(timeout_ms=int(timeout * 1000), using=json.dumps(by), value=json.dumps(value),
+                                poll_ms=SERVER_POLL_MS)
+    result = driver.execute_driver(script, timeout_ms=int(timeout * 1000) + SCRIPT_MARGIN_MS).result
+    # Element references in the response are already turned into WebElements by driver.execute
+    return result or None
+
+def find_with_implicit_wait(driver, by, value, timeout):
+    """Wait for the locator with a scoped implicit wait; returns the element or None"""
+    with implicit_wait(driver, timeout):
+        elements = driver.find_elements(by, value)
+    return elements[0] if elements else None
+
+def server_wait_method(driver):
+    """execute_driver until the server shows it lacks the plugin, then the implicit-wait fallback"""
+    return getattr(driver, "_server_wait_method", EXECUTE_DRIVER)
+
+def wait_on_server(driver, by, value, timeout=10):
+    """Wait for an element on the Appium server instead of polling from here; returns it or None"""
+    element = cached_element(driver, by, value)
+    if element is not None:
+        return element
+    locator = (by, value)
+    started = time.monotonic()
+    element = None
+    if server_wait_method(driver) == EXECUTE_DRIVER:
+        try:
+            element = find_with_execute_driver(driver, *optimize_locator(by, value), timeout)
+        except WebDriverException as e:
+            # No execute-driver plugin, the execute_driver_script insecure feature isn't enabled, or the
+            # script failed: wait with the implicit timeout instead, for the rest of this session
+            if not isinstance(e, UnknownMethodException):
+                print(f"Can't wait for elements with execute_driver, using implicit waits instead: {e}")
+            driver._server_wait_method = IMPLICIT
+    if server_wait_method(driver) == IMPLICIT:
+        try:
+            # Whatever execute_driver already spent counts against the caller's timeout
+            remaining = max(0, timeout - (time.monotonic() - started))
+            element = find_with_implicit_wait(driver, by, value, remaining)
+        except WebDriverException as e:
+            print(f"Error waiting for {value}: {e}")
+    if element is None:
+        locator_stats.record_timeout(locator)
+    else:
+        locator_stats.record(locator, time.monotonic() - started)
+        remember(driver, by, value, element)
+    return element
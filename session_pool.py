@@ -0,0 +1,200 @@
+from appium import webdriver
+from appium.options.common.base import AppiumOptions
+from port_allocator import adopt_ports, leased_ports, release_ports
+import json
+import os
+import re
+import sys
+import threading
+
+# One file per device with the session last returned to the pool, so the next process can reattach to it
+SESSION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sessions")
+
+class AttachedRemote(webdriver.Remote):
+    """Remote driver bound to a session that already exists on the server instead of creating one"""
+
+    def __init__(self, server_url, session_id, capabilities):
+        self._attach_to = (session_id, capabilities)
+        super().__init__(server_url, options=AppiumOptions(), direct_connection=False)
+
+    def start_session(self, capabilities, browser_profile=None):
+        self.session_id, self.caps = self._attach_to
+
+def server_url(driver):
+    """URL of the Appium server the driver talks to"""
+    return driver.command_executor._client_config.remote_server_addr
+
+class SessionPool:
+    """Keeps Appium sessions alive between runs, keyed by (device, appPackage)
+
+    Sessions returned to the pool are also written to SESSION_DIR and stay open on the server when the
+    process exits, so the next process on the device reattaches to them instead of starting a new one.
+    Run `python session_pool.py close` to quit them.
+    """
+
+    def __init__(self, session_dir=SESSION_DIR):
+        self.sessions = {}
+        self.session_dir = session_dir
+        self.lock = threading.Lock()
+
+    def is_healthy(self, driver):
+        """Check that the session itself still answers, not just the Appium server behind it"""
+        try:
+            driver.current_activity
+            return bool(driver.session_id)
+        except Exception as e:
+            print(f"Pooled session failed its health check: {e}")
+            return False
+
+    def reset_app(self, driver, app_package):
+        """Restart the app inside the existing session instead of creating a new session"""
+        try:
+            driver.terminate_app(app_package)
+            driver.activate_app(app_package)
+            return True
+        except Exception as e:
+            print(f"Error resetting {app_package} in pooled session: {e}")
+            return False
+
+    def close_session(self, device_id, driver):
+        """Quit a session and give back the ports it held"""
+        try:
+            driver.quit()
+            print("Session ended")
+        except Exception as e:
+            print(f"Error ending session: {e}")
+        if device_id:
+            release_ports(device_id)
+
+    def record_path(self, device_id):
+        return os.path.join(self.session_dir, re.sub(r"[^\w.-]", "_", device_id) + ".json")
+
+    def load_record(self, device_id):
+        """The session another process left for the device, or None"""
+        path = self.record_path(device_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error reading pooled session for {device_id}: {e}")
+            return None
+
+    def save_record(self, device_id, app_package, driver):
+        """Write down the session so a later process can reattach to it"""
+        record = {
+            "app_package": app_package,
+            "server_url": server_url(driver),
+            "session_id": driver.session_id,
+            "capabilities": driver.caps,
+            "ports": leased_ports(device_id)
+        }
+        try:
+            os.makedirs(self.session_dir, exist_ok=True)
+            path = self.record_path(device_id)
+            with open(path + ".tmp", "w") as f:
+                json.dump(record, f, indent=1)
+            os.replace(path + ".tmp", path)
+        except Exception as e:
+            print(f"Error saving pooled session for {device_id}: {e}")
+
+    def drop_record(self, device_id, session_id=None):
+        """Forget the stored session for the device (only if it is session_id, when given)"""
+        record = self.load_record(device_id)
+        if record is None or (session_id and record.get("session_id") != session_id):
+            return
+        try:
+            os.remove(self.record_path(device_id))
+        except OSError:
+            pass
+
+    def attach(self, device_id, record, prepare_driver=None):
+        """Reattach to a stored session without contacting the server; None when the record is unusable"""
+        try:
+            driver = AttachedRemote(record["server_url"], record["session_id"], record["capabilities"])
+        except Exception as e:
+            print(f"Error reattaching to session {record.get('session_id')}: {e}")
+            return None
+        # This process now holds the session's ports, so they are released when it is closed
+        adopt_ports(device_id, record.get("ports") or {})
+        if prepare_driver:
+            prepare_driver(driver)
+        return driver
+
+    def acquire(self, device_id, app_package, create_driver, prepare_driver=None):
+        """Hand out a live session for the device and app, creating one with create_driver(device_id) if needed
+
+        prepare_driver(driver) sets up a session reattached from an earlier process the way create_driver
+        sets up a new one.
+        """
+        if not device_id:
+            return create_driver(device_id)
+
+        stale = []
+        with self.lock:
+            driver = self.sessions.pop((device_id, app_package), None)
+            # UiAutomator2 runs one session per device, so idle sessions for other apps have to go
+            for key in [key for key in self.sessions if key[0] == device_id]:
+                stale.append(self.sessions.pop(key))
+        for other in stale:
+            self.close_session(device_id, other)
+
+        if driver is None:
+            record = self.load_record(device_id)
+            if record:
+                self.drop_record(device_id)
+                driver = self.attach(device_id, record, prepare_driver)
+                if driver and record.get("app_package") != app_package:
+                    self.close_session(device_id, driver)
+                    driver = None
+
+        if driver:
+            if self.is_healthy(driver) and self.reset_app(driver, app_package):
+                print(f"Reusing pooled session on {device_id}")
+                return driver
+            self.close_session(device_id, driver)
+        return create_driver(device_id)
+
+    def release(self, device_id, app_package, driver):
+        """Return a session to the pool so the next run on the device, in this process or another, can reuse it"""
+        if not device_id:
+            self.close_session(device_id, driver)
+            return
+        with self.lock:
+            previous = self.sessions.get((device_id, app_package))
+            self.sessions[(device_id, app_package)] = driver
+        if previous and previous is not driver:
+            self.close_session(device_id, previous)
+        self.save_record(device_id, app_package, driver)
+        print("Session returned to pool")
+
+    def close_all(self):
+        """Quit every pooled session, including the ones stored for other processes"""
+        with self.lock:
+            sessions = list(self.sessions.items())
+            self.sessions.clear()
+        for (device_id, _), driver in sessions:
+            self.drop_record(device_id, driver.session_id)
+            self.close_session(device_id, driver)
+        if not os.path.isdir(self.session_dir):
+            return
+        for name in os.listdir(self.session_dir):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(self.session_dir, name)) as f:
+                record = json.load(f)
+            os.remove(os.path.join(self.session_dir, name))
+            device_id = name[:-len(".json")]
+            driver = self.attach(device_id, record)
+            if driver:
+                self.close_session(device_id, driver)
+
+session_pool = SessionPool()
+
+if __name__ == "__main__":
+
+    if sys.argv[1:] == ["close"]:
+        session_pool.close_all()
+    else:
+        print("Usage: python session_pool.py close    (quit every session kept for reuse)")
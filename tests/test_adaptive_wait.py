@@ -0,0 +1,45 @@
+from adaptive_wait import LocatorStats
+import os
+import tempfile
+import unittest
+
+LOCATOR = ("id", "com.twitter.android:id/inline_like")
+
+class TestSuggestedTimeout(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        os.remove(self.path)
+        self.stats = LocatorStats(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_no_history_uses_the_callers_timeout(self):
+        self.assertEqual(self.stats.suggested_timeout(LOCATOR, 10), 10)
+
+    def test_fast_locator_never_goes_below_the_callers_timeout(self):
+        for _ in range(20):
+            self.stats.record(LOCATOR, 0.1)
+        self.assertEqual(self.stats.suggested_timeout(LOCATOR, 10), 10)
+
+    def test_slow_locator_widens(self):
+        for _ in range(20):
+            self.stats.record(LOCATOR, 4)
+        self.assertEqual(self.stats.suggested_timeout(LOCATOR, 10), 12)
+
+    def test_recorded_timeouts_widen_up_to_the_cap(self):
+        for _ in range(10):
+            self.stats.record(LOCATOR, 0.1)
+        for _ in range(10):
+            self.stats.record_timeout(LOCATOR)
+        self.assertEqual(self.stats.suggested_timeout(LOCATOR, 10), 15)
+        for _ in range(1000):
+            self.stats.record_timeout(LOCATOR)
+        self.assertLessEqual(self.stats.suggested_timeout(LOCATOR, 10), 20)
+        self.assertGreater(self.stats.suggested_timeout(LOCATOR, 10), 19)
+
+if __name__ == "__main__":
+    unittest.main()
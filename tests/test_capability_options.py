@@ -0,0 +1,26 @@
+from capability_options import build_options
+import contextlib
+import io
+import unittest
+
+class TestBuildOptions(unittest.TestCase):
+
+    def test_known_capabilities_are_prefixed(self):
+        caps = build_options({"platformName": "Android", "systemPort": 8200}).to_capabilities()
+        self.assertEqual(caps["platformName"], "Android")
+        self.assertEqual(caps["appium:systemPort"], 8200)
+
+    def test_capability_missing_from_the_table_is_passed_through(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            caps = build_options({"autoWebView": True, "appLocale": {"language": "fr"}}).to_capabilities()
+        self.assertIs(caps["appium:autoWebView"], True)
+        self.assertEqual(caps["appium:appLocale"], {"language": "fr"})
+
+    def test_wrong_type_is_rejected(self):
+        with self.assertRaises(TypeError):
+            build_options({"systemPort": "8200"})
+        with self.assertRaises(TypeError):
+            build_options({"newCommandTimeout": True})
+
+if __name__ == "__main__":
+    unittest.main()
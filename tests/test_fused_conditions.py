@@ -0,0 +1,81 @@
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from server_wait import IMPLICIT
+import fused_conditions
+import contextlib
+import io
+import types
+import unittest
+
+LOCATOR = (AppiumBy.ID, "com.reddit.frontpage:id/join")
+
+class FakeElement:
+    def __init__(self, displayed=True, enabled=True):
+        self.displayed = displayed
+        self.enabled = enabled
+
+    def is_displayed(self):
+        return self.displayed
+
+    def is_enabled(self):
+        return self.enabled
+
+class FakeDriver:
+    """execute_driver answers with result (or raises error); find_element serves the classic conditions"""
+
+    def __init__(self, result=None, error=None, element=None):
+        self.result = result
+        self.error = error
+        self.element = element
+        self.sent = []
+
+    def execute_driver(self, script, script_type="webdriverio", timeout_ms=None):
+        self.sent.append("executeDriver")
+        if self.error:
+            raise self.error
+        return types.SimpleNamespace(result=self.result)
+
+    def find_element(self, by, value):
+        self.sent.append("findElement")
+        if self.element is None:
+            raise NoSuchElementException(value)
+        return self.element
+
+class TestFusedConditions(unittest.TestCase):
+
+    def test_clickable_element_takes_one_request(self):
+        element = FakeElement()
+        driver = FakeDriver(result=element)
+        self.assertIs(fused_conditions.element_to_be_clickable(LOCATOR)(driver), element)
+        self.assertEqual(driver.sent, ["executeDriver"])
+
+    def test_unsatisfied_condition_takes_one_request(self):
+        driver = FakeDriver(result=None)
+        self.assertFalse(fused_conditions.element_to_be_clickable(LOCATOR)(driver))
+        self.assertEqual(driver.sent, ["executeDriver"])
+
+    def test_script_checks_every_state(self):
+        script = fused_conditions.check_script(LOCATOR, ("displayed", "enabled", "text"), 'say "hi"')
+        self.assertIn("isElementDisplayed", script)
+        self.assertIn("isElementEnabled", script)
+        self.assertIn('.includes("say \\"hi\\"")', script)
+
+    def test_rejected_execute_driver_falls_back_to_the_classic_condition(self):
+        element = FakeElement(enabled=False)
+        driver = FakeDriver(error=WebDriverException("insecure feature not enabled"), element=element)
+        condition = fused_conditions.element_to_be_clickable(LOCATOR)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(condition(driver))
+        self.assertEqual(driver._server_wait_method, IMPLICIT)
+        element.enabled = True
+        self.assertIs(condition(driver), element)
+        self.assertEqual(driver.sent, ["executeDriver", "findElement", "findElement"])
+
+    def test_presence_is_one_plain_find(self):
+        element = FakeElement()
+        driver = FakeDriver(element=element)
+        self.assertIs(fused_conditions.presence_of_element_located(LOCATOR)(driver), element)
+        self.assertEqual(driver.sent, ["findElement"])
+
+if __name__ == "__main__":
+    unittest.main()
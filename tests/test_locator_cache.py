@@ -0,0 +1,84 @@
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.locator_converter import LocatorConverter
+from locator_cache import ACTIVITY_SCRIPT, cached_element, install
+import unittest
+
+FIND = {"using": AppiumBy.ID, "value": "com.twitter.android:id/inline_like"}
+
+class FakeDriver:
+    """Answers finds with a new element id each time and reports an activity the test can change"""
+
+    def __init__(self, activity=".MainActivity"):
+        self.session_id = "s1"
+        self.activity = activity
+        self.sent = []
+
+    def execute(self, driver_command, params=None):
+        self.sent.append(driver_command)
+        if driver_command == "w3cExecuteScript" and params["script"] == ACTIVITY_SCRIPT:
+            if self.activity is None:
+                raise WebDriverException("Unknown mobile command")
+            return {"value": self.activity}
+        return {"value": f"element-{len(self.sent)}"}
+
+    def finds(self):
+        return self.sent.count("findElement")
+
+class TestLocatorCache(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = install(FakeDriver())
+
+    def test_repeat_lookup_is_served_from_cache(self):
+        first = self.driver.execute("findElement", dict(FIND))["value"]
+        second = self.driver.execute("findElement", dict(FIND))["value"]
+        self.assertEqual(first, second)
+        self.assertEqual(self.driver.finds(), 1)
+
+    def test_repeat_lookups_check_the_activity_once_per_screen(self):
+        for _ in range(3):
+            self.driver.execute("findElement", dict(FIND))
+        self.assertEqual(self.driver.sent, ["findElement", "w3cExecuteScript"])
+        self.driver.execute("clickElement", {"id": "element-1"})
+        for _ in range(3):
+            self.driver.execute("findElement", dict(FIND))
+        self.assertEqual(self.driver.sent[2:], ["clickElement", "findElement", "w3cExecuteScript"])
+
+    def test_activity_change_the_client_did_not_ask_about_clears_the_cache(self):
+        self.driver.execute("findElement", dict(FIND))
+        self.driver.execute("findElement", dict(FIND))
+        self.driver.execute("clickElement", {"id": "element-1"})
+        first = self.driver.execute("findElement", dict(FIND))["value"]
+        self.driver.activity = ".ComposerActivity"
+        second = self.driver.execute("findElement", dict(FIND))["value"]
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.driver.finds(), 3)
+        # The activity was just looked up, so the new element is served without asking again
+        self.assertEqual(self.driver.execute("findElement", dict(FIND))["value"], second)
+        self.assertEqual(self.driver.sent.count("w3cExecuteScript"), 2)
+
+    def test_cached_element_checks_the_activity_too(self):
+        self.driver.locator_converter = LocatorConverter()
+        self.driver.execute("findElement", dict(FIND))
+        self.driver.execute("findElement", dict(FIND))
+        self.driver.execute("clickElement", {"id": "element-1"})
+        self.driver.execute("findElement", dict(FIND))
+        self.driver.activity = ".ComposerActivity"
+        self.assertIsNone(cached_element(self.driver, FIND["using"], FIND["value"]))
+
+    def test_screen_changing_command_clears_the_cache(self):
+        self.driver.execute("findElement", dict(FIND))
+        self.driver.execute("clickElement", {"id": "element-2"})
+        self.driver.execute("findElement", dict(FIND))
+        self.assertEqual(self.driver.finds(), 2)
+
+    def test_session_without_activities_still_caches(self):
+        driver = install(FakeDriver(activity=None))
+        driver.execute("findElement", dict(FIND))
+        driver.execute("findElement", dict(FIND))
+        self.assertEqual(driver.finds(), 1)
+        self.assertEqual(driver.sent.count("w3cExecuteScript"), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+from appium.webdriver.common.appiumby import AppiumBy
+from locator_optimizer import install, optimize_locator, rewrite_xpath
+import unittest
+
+class FakeDriver:
+    """Records the commands the rewriting execute passes on"""
+
+    def __init__(self):
+        self.sent = []
+
+    def execute(self, driver_command, params=None):
+        self.sent.append((driver_command, params))
+        return {"value": None}
+
+class TestRewriteXPath(unittest.TestCase):
+
+    def test_exact_rewrites(self):
+        self.assertEqual(rewrite_xpath("//*[@resource-id='com.twitter.android:id/inline_like']"),
+                         (AppiumBy.ID, "com.twitter.android:id/inline_like"))
+        self.assertEqual(rewrite_xpath("//android.widget.Button[contains(@text, 'Post')]"),
+                         (AppiumBy.ANDROID_UIAUTOMATOR,
+                          'new UiSelector().className("android.widget.Button").textContains("Post")'))
+
+    def test_or_is_not_rewritten(self):
+        self.assertIsNone(rewrite_xpath("//android.widget.Button[@text='Post it' or @text='x']"))
+        self.assertIsNone(rewrite_xpath("//android.widget.Button[contains(@text, 'Post') or @text='x']"))
+
+    def test_or_inside_a_value_is_rewritten(self):
+        self.assertEqual(rewrite_xpath("//android.widget.Button[@text='this or that']"),
+                         (AppiumBy.ANDROID_UIAUTOMATOR,
+                          'new UiSelector().className("android.widget.Button").text("this or that")'))
+
+    def test_unbalanced_quotes_are_not_rewritten(self):
+        self.assertIsNone(rewrite_xpath("//android.widget.Button[@text='Post it]"))
+        self.assertIsNone(rewrite_xpath("//android.widget.Button[@text=\"Post it']"))
+
+    def test_other_functions_are_not_rewritten(self):
+        for xpath in ("//android.widget.Button[normalize-space(@text)='Post']",
+                      "//android.widget.Button[text()='Post']",
+                      "//android.widget.Button[translate(@text, 'P', 'p')='post']"):
+            self.assertIsNone(rewrite_xpath(xpath), xpath)
+
+    def test_absolute_path_from_element_is_not_rewritten(self):
+        self.assertIsNone(rewrite_xpath("//android.widget.EditText", from_element=True))
+        self.assertEqual(rewrite_xpath(".//android.widget.EditText", from_element=True),
+                         (AppiumBy.CLASS_NAME, "android.widget.EditText"))
+        self.assertEqual(optimize_locator(AppiumBy.XPATH, "//android.widget.EditText", from_element=True),
+                         (AppiumBy.XPATH, "//android.widget.EditText"))
+
+class TestInstall(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = FakeDriver()
+        install(self.driver)
+
+    def test_driver_lookup_is_rewritten(self):
+        self.driver.execute("findElement", {"using": AppiumBy.XPATH, "value": "//android.widget.EditText"})
+        self.assertEqual(self.driver.sent[-1][1], {"using": AppiumBy.CLASS_NAME, "value": "android.widget.EditText"})
+
+    def test_absolute_lookup_from_element_stays_document_scoped(self):
+        params = {"using": AppiumBy.XPATH, "value": "//android.widget.EditText", "id": "e1"}
+        self.driver.execute("findChildElements", params)
+        self.assertEqual(self.driver.sent[-1], ("findChildElements", params))
+
+    def test_relative_lookup_from_element_is_rewritten(self):
+        self.driver.execute("findChildElement", {"using": AppiumBy.XPATH, "value": ".//android.widget.EditText",
+                                                 "id": "e1"})
+        self.assertEqual(self.driver.sent[-1][1],
+                         {"using": AppiumBy.CLASS_NAME, "value": "android.widget.EditText", "id": "e1"})
+
+    def test_or_lookup_is_sent_unchanged(self):
+        params = {"using": AppiumBy.XPATH, "value": "//android.widget.Button[@text='Post it' or @text='x']"}
+        self.driver.execute("findElement", params)
+        self.assertEqual(self.driver.sent[-1][1], params)
+
+    def test_install_twice_rewrites_once(self):
+        execute = self.driver.execute
+        install(self.driver)
+        self.assertIs(self.driver.execute, execute)
+
+if __name__ == "__main__":
+    unittest.main()
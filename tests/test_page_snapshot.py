@@ -0,0 +1,81 @@
+from appium.webdriver.common.appiumby import AppiumBy
+from page_snapshot import PageSnapshot, UnsupportedLocator, parse_xpath, tap_node
+import unittest
+
+PAGE_SOURCE = """<?xml version="1.0" encoding="UTF-8"?>
+<hierarchy>
+  <android.widget.FrameLayout resource-id="com.reddit.frontpage:id/root" bounds="[0,0][1080,2400]">
+    <android.view.View resource-id="post_unit" bounds="[0,100][1080,900]">
+      <android.widget.TextView resource-id="com.reddit.frontpage:id/author" text="someone" bounds="[10,110][300,160]"/>
+      <android.widget.Button text="Post it" content-desc="Post" bounds="[800,800][1000,880]"/>
+      <android.widget.Button text="" bounds="[600,800][700,880]"/>
+    </android.view.View>
+    <android.widget.TextView text="a]b and c" resource-id="com.reddit.frontpage:id/title"/>
+    <android.widget.Button text="x"/>
+  </android.widget.FrameLayout>
+</hierarchy>"""
+
+class TestXPathEvaluation(unittest.TestCase):
+
+    def setUp(self):
+        self.snapshot = PageSnapshot(PAGE_SOURCE)
+
+    def find_all(self, xpath):
+        return self.snapshot.find_all(AppiumBy.XPATH, xpath)
+
+    def test_attribute_equality(self):
+        matches = self.find_all("//android.widget.Button[@text='Post it']")
+        self.assertEqual([node.content_desc for node in matches], ["Post"])
+
+    def test_double_quoted_value_with_and(self):
+        matches = self.find_all('//android.widget.Button[@text="Post it" and @content-desc=\'Post\']')
+        self.assertEqual(len(matches), 1)
+
+    def test_quoted_value_containing_bracket_and_keyword(self):
+        matches = self.find_all("//android.widget.TextView[@text='a]b and c']")
+        self.assertEqual([node.resource_id for node in matches], ["com.reddit.frontpage:id/title"])
+
+    def test_empty_value_is_not_served_from_the_index(self):
+        matches = self.find_all("//android.widget.Button[@text='']")
+        self.assertEqual([node.bounds for node in matches], [(600, 800, 700, 880)])
+
+    def test_or_is_unsupported(self):
+        for xpath in ("//android.widget.Button[@text='Post it' or @text='x']",
+                      "//android.widget.Button[contains(@text, 'Post') or @text='x']"):
+            with self.assertRaises(UnsupportedLocator):
+                self.find_all(xpath)
+
+    def test_parent_step_is_unsupported(self):
+        with self.assertRaises(UnsupportedLocator):
+            self.find_all("//android.widget.Button/..")
+
+    def test_unbalanced_quotes_are_unsupported(self):
+        with self.assertRaises(UnsupportedLocator):
+            parse_xpath("//android.widget.Button[@text='Post it]")
+
+    def test_class_names_with_dots_still_parse(self):
+        steps = parse_xpath("//android.view.View[@resource-id='post_unit']/android.widget.Button[1]")
+        self.assertEqual([name for _, name, _, _ in steps], ["android.view.View", "android.widget.Button"])
+
+    def test_relative_search_from_node(self):
+        post = self.snapshot.find(AppiumBy.XPATH, "//android.view.View[@resource-id='post_unit']")
+        author = post.find(".//android.widget.TextView[@resource-id='com.reddit.frontpage:id/author']")
+        self.assertEqual(author.text, "someone")
+
+class TestTapNode(unittest.TestCase):
+
+    def test_node_without_bounds_is_not_tapped(self):
+        taps = []
+
+        class Driver:
+            def tap(self, points):
+                taps.append(points)
+
+        snapshot = PageSnapshot(PAGE_SOURCE)
+        title = snapshot.find(AppiumBy.ID, "com.reddit.frontpage:id/title")
+        self.assertFalse(tap_node(Driver(), title))
+        self.assertTrue(tap_node(Driver(), snapshot.find(AppiumBy.ACCESSIBILITY_ID, "Post")))
+        self.assertEqual(taps, [[(900, 840)]])
+
+if __name__ == "__main__":
+    unittest.main()
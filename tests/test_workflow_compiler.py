@@ -0,0 +1,42 @@
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import NoSuchElementException, UnknownMethodException, WebDriverException
+from server_wait import IMPLICIT
+from workflow_compiler import run_workflow
+import types
+import unittest
+
+STEPS = [{"op": "click", "locator": (AppiumBy.ID, "com.reddit.frontpage:id/comment")}]
+
+class FakeDriver:
+    """execute_driver answers with the given result, or raises the given exception"""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+
+    def execute_driver(self, script, script_type="webdriverio", timeout_ms=None):
+        if self.error:
+            raise self.error
+        return types.SimpleNamespace(result=self.result)
+
+class TestRunWorkflow(unittest.TestCase):
+
+    def test_results_are_returned(self):
+        driver = FakeDriver(result={"ok": True, "results": {"step0": None}})
+        self.assertEqual(run_workflow(driver, STEPS), {"step0": None})
+
+    def test_rejected_execute_driver_falls_back(self):
+        for error in (UnknownMethodException("no plugin"),
+                      WebDriverException("execute_driver_script insecure feature is not enabled")):
+            driver = FakeDriver(error=error)
+            self.assertIsNone(run_workflow(driver, STEPS))
+            self.assertEqual(driver._server_wait_method, IMPLICIT)
+            self.assertIsNone(run_workflow(driver, STEPS))
+
+    def test_failure_reported_by_the_script_is_raised(self):
+        driver = FakeDriver(result={"ok": False, "step": 0, "error": "no such element", "message": "nope"})
+        with self.assertRaises(NoSuchElementException):
+            run_workflow(driver, STEPS)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from workflow_engine import WorkflowEngine, plan_steps
+import concurrent.futures
+import unittest
+
+def branch(then=(), otherwise=()):
+    return {"name": "dialog", "if": {"id": "dialog"}, "then": list(then), "else": list(otherwise)}
+
+def button(name="ok", within="dialog"):
+    return {"name": name, "within": within, "locate": {"id": "ok"}, "act": "click"}
+
+class FakeElement:
+    def __init__(self):
+        self.clicked = 0
+
+    def find_elements(self, by, value):
+        return [self]
+
+    def click(self):
+        self.clicked += 1
+
+class FakeDriver:
+    """Just enough of a driver for steps that search inside an earlier element"""
+
+    def __init__(self):
+        self.command_executor = object()
+
+    def implicitly_wait(self, seconds):
+        pass
+
+class TestBranchElements(unittest.TestCase):
+
+    def test_then_steps_can_search_in_the_branch_element(self):
+        planned = plan_steps([branch(then=[button()])])
+        self.assertEqual(planned[0]["then"][0]["within"], "dialog")
+
+    def test_else_steps_cannot_search_in_the_branch_element(self):
+        with self.assertRaises(ValueError):
+            plan_steps([branch(otherwise=[button()])])
+
+    def test_later_steps_cannot_search_in_the_branch_element(self):
+        with self.assertRaises(ValueError):
+            plan_steps([branch(), button()])
+
+    def test_branch_stores_its_element(self):
+        dialog = FakeElement()
+        engine = WorkflowEngine(FakeDriver(), concurrent.futures.ThreadPoolExecutor(max_workers=1))
+        engine.locate = lambda step: dialog if step["kind"] == "branch" else WorkflowEngine.locate(engine, step)
+        self.assertTrue(engine.run_steps(plan_steps([branch(then=[button()])])))
+        self.assertIs(engine.elements["dialog"], dialog)
+        self.assertEqual(dialog.clicked, 1)
+
+if __name__ == "__main__":
+    unittest.main()
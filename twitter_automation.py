@@ -1,59 +1,47 @@
 from appium import webdriver
 from appium.webdriver.common.appiumby import AppiumBy
-from selenium.webdriver.support.ui import WebDriverWait 
-from selenium.webdriver.support import expected_conditions as EC
-from appium.options.android import UiAutomator2Options
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
-import subprocess
-import time
+from selenium.common.exceptions import NoSuchElementException
+from adb_preflight import get_connected_devices, preflight, run_preflight
+from fleet_runner import run_fleet, print_fleet_report
+from port_allocator import lease_ports, release_ports, find_appium_servers
+from capability_options import build_options
+from session_pool import session_pool
+from ui_settle import enable_idle_waits, wait_for_idle
+from server_wait import wait_on_server
+from locator_optimizer import install as install_locator_optimizer
+from locator_cache import install as install_locator_cache
+from command_tracer import traced_step, attach as attach_tracer
+from command_batch import install as install_command_batch
 import os
 
-def get_connected_devices():
-    """Get a list of connected Android devices using adb"""
-    try:
-        result = subprocess.run(['adb', 'devices'], capture_output=True, text=True)
-        lines = result.stdout.strip().split('\n')[1:]
-        devices = []
-        for line in lines:
-            if line.strip() and 'device' in line:
-                device_id = line.split('\t')[0]
-                devices.append(device_id)
-        return devices
-    except Exception as e:
-        print(f"Error getting device list: {e}")
-        return []
-
-def verify_app_installed(device_id):
-    """Verify if Twitter app is installed on the device"""
-    try:
-        result = subprocess.run(
-            ['adb', '-s', device_id, 'shell', 'pm', 'list', 'packages', 'com.twitter.android'],
-            capture_output=True,
-            text=True
-        )
-        return 'com.twitter.android' in result.stdout
-    except Exception as e:
-        print(f"Error checking Twitter app installation: {e}")
-        return False
-
-def grant_permissions(device_id):
-    """Grant necessary permissions to the Twitter app"""
-    permissions = [
-        "android.permission.WRITE_EXTERNAL_STORAGE",
-        "android.permission.READ_EXTERNAL_STORAGE",
-        "android.permission.CAMERA"
-    ]
-    try:
-        for permission in permissions:
-            subprocess.run([
-                'adb', '-s', device_id, 'shell', 
-                'pm', 'grant', 'com.twitter.android', permission
-            ], capture_output=True)
-    except Exception as e:
-        print(f"Error granting permissions: {e}")
+APP_PACKAGE = "com.twitter.android"
+
+# Permissions granted to the Twitter app before each session
+PERMISSIONS = [
+    "android.permission.WRITE_EXTERNAL_STORAGE",
+    "android.permission.READ_EXTERNAL_STORAGE",
+    "android.permission.CAMERA"
+]
+
+LIKE_BUTTON = "com.twitter.android:id/inline_like"
+REPLY_BUTTON = "com.twitter.android:id/inline_reply"
+COMPOSE_BUTTON = "com.twitter.android:id/composer_write"
+TWEET_TEXT = "com.twitter.android:id/tweet_text"
+TWEET_BUTTON = "com.twitter.android:id/button_tweet"
+REPLY_TEXT = "Great post!"
+POST_TEXT = "Hello Twitter! This is an automated post #automation"
+
+def prepare_driver(driver):
+    """Install the lookup and batching helpers on a new or reattached session"""
+    install_locator_optimizer(driver)
+    install_locator_cache(driver)
+    install_command_batch(driver)
+    return driver
 
 def setup_driver(device_id=None):
     """Set up the Appium driver with enhanced error handling"""
+    driver = None
+    ports = None
     try:
         if not device_id:
             devices = get_connected_devices()
@@ -63,18 +51,17 @@ def setup_driver(device_id=None):
             device_id = devices[0]
 
         
-        if not verify_app_installed(device_id):
+        if not preflight(device_id, APP_PACKAGE, PERMISSIONS):
             print("Twitter app is not installed on the device!")
             return None
 
-        
-        grant_permissions(device_id)
+        ports = lease_ports(device_id)
 
         capabilities = {
             "platformName": "Android",
             "automationName": "UiAutomator2",
             "deviceName": device_id,
-            "appPackage": "com.twitter.android",
+            "appPackage": APP_PACKAGE,
             "appActivity": ".StartActivity",
             "noReset": True,
             "autoGrantPermissions": True,
@@ -82,7 +69,9 @@ def setup_driver(device_id=None):
             "disableWindowAnimation": True,
             "newCommandTimeout": 6000,
             "androidInstallTimeout": 90000,
-            "systemPort": 8201,
+            "systemPort": ports["systemPort"],
+            "chromedriverPort": ports["chromedriverPort"],
+            "mjpegServerPort": ports["mjpegServerPort"],
             "skipDeviceInitialization": True,
             "skipServerInstallation": False,  
             "uiautomator2ServerInstallTimeout": 120000,  
@@ -92,102 +81,112 @@ def setup_driver(device_id=None):
             "avdLaunchTimeout": 60000
         }
         
-        options = UiAutomator2Options().load_capabilities(capabilities)
+        options = build_options(capabilities)
         
         
-        ports = [4723, 4724, 4725, 4726]
+        servers = find_appium_servers()
+        if not servers:
+            print("No Appium server is listening on ports 4723-4726!")
+            return None
+
         driver = None
-        
-        for port in ports:
+        for server_url in servers:
             try:
-                driver = webdriver.Remote(f'http://127.0.0.1:{port}', options=options)
-                print(f"Successfully connected to Appium server on port {port}")
+                driver = webdriver.Remote(server_url, options=options)
+                print(f"Successfully connected to Appium server at {server_url}")
+                prepare_driver(driver)
                 break
             except Exception as e:
-                print(f"Failed to connect on port {port}: {e}")
+                print(f"Failed to connect to {server_url}: {e}")
+                driver = None
                 continue
-        
+
         return driver
 
     except Exception as e:
         print(f"Error setting up driver: {e}")
         return None
+    finally:
+        # Give the lease back unless a session now uses the ports
+        if ports is not None and driver is None:
+            release_ports(device_id)
 
 def wait_for_element(driver, by, value, timeout=10):
     """Wait for element to be present and return it"""
-    try:
-        wait = WebDriverWait(driver, timeout)
-        element = wait.until(EC.presence_of_element_located((by, value)))
-        return element
-    except TimeoutException:
+    element = wait_on_server(driver, by, value, timeout)
+    if element is None:
         print(f"Element not found: {value}")
-        return None
+    return element
 
+@traced_step
 def like_post(driver):
     """Like a post with enhanced error handling"""
     try:
-        like_button = wait_for_element(driver, AppiumBy.ID, "com.twitter.android:id/inline_like")
+        like_button = wait_for_element(driver, AppiumBy.ID, LIKE_BUTTON)
         if like_button:
             like_button.click()
             print("Post liked successfully")
-            time.sleep(2)
+            wait_for_idle(driver, timeout=2)
         else:
             print("Like button not found")
     except Exception as e:
         print(f"Error liking post: {e}")
 
+@traced_step
 def comment_on_post(driver):
     """Comment on a post with enhanced error handling"""
     try:
-        comment_button = wait_for_element(driver, AppiumBy.ID, "com.twitter.android:id/inline_reply")
+        comment_button = wait_for_element(driver, AppiumBy.ID, REPLY_BUTTON)
         if comment_button:
             comment_button.click()
             print("Clicked comment button")
-            time.sleep(2)
+            wait_for_idle(driver, timeout=2)
 
-            comment_box = wait_for_element(driver, AppiumBy.ID, "com.twitter.android:id/tweet_text")
+            comment_box = wait_for_element(driver, AppiumBy.ID, TWEET_TEXT)
             if comment_box:
-                comment_box.send_keys("Great post!")
+                comment_box.send_keys(REPLY_TEXT)
                 print("Entered comment text")
-                time.sleep(1)
+                wait_for_idle(driver, timeout=1)
 
-                post_button = wait_for_element(driver, AppiumBy.ID, "com.twitter.android:id/button_tweet")
+                post_button = wait_for_element(driver, AppiumBy.ID, TWEET_BUTTON)
                 if post_button:
                     post_button.click()
                     print("Posted comment")
-                    time.sleep(2)
+                    wait_for_idle(driver, timeout=2)
     except Exception as e:
         print(f"Error commenting on post: {e}")
 
+@traced_step
 def tap_post_button_twice(driver):
     """Double tap post button with enhanced error handling"""
     try:
-        new_post_button = wait_for_element(driver, AppiumBy.ID, "com.twitter.android:id/composer_write")
+        new_post_button = wait_for_element(driver, AppiumBy.ID, COMPOSE_BUTTON)
         if new_post_button:
             new_post_button.click()
             print("First tap on post button")
-            time.sleep(2)
+            wait_for_idle(driver, timeout=2)
 
             new_post_button.click()
             print("Second tap on post button")
-            time.sleep(2)
+            wait_for_idle(driver, timeout=2)
     except Exception as e:
         print(f"Error tapping post button: {e}")
 
+@traced_step
 def make_new_post(driver):
     """Make a new post with enhanced error handling"""
     try:
-        tweet_box = wait_for_element(driver, AppiumBy.ID, "com.twitter.android:id/tweet_text")
+        tweet_box = wait_for_element(driver, AppiumBy.ID, TWEET_TEXT)
         if tweet_box:
-            tweet_box.send_keys("Hello Twitter! This is an automated post #automation")
+            tweet_box.send_keys(POST_TEXT)
             print("Entered tweet text")
-            time.sleep(2)
+            wait_for_idle(driver, timeout=2)
 
-            post_button = wait_for_element(driver, AppiumBy.ID, "com.twitter.android:id/button_tweet")
+            post_button = wait_for_element(driver, AppiumBy.ID, TWEET_BUTTON)
             if post_button:
                 post_button.click()
                 print("Posted tweet successfully")
-                time.sleep(2)
+                wait_for_idle(driver, timeout=2)
     except Exception as e:
         print(f"Error making new post: {e}")
 
@@ -196,22 +195,24 @@ def open_twitter(device_id=None):
     driver = None
     try:
         print("Starting Twitter automation...")
-        driver = setup_driver(device_id)
+        driver = session_pool.acquire(device_id, APP_PACKAGE, setup_driver, prepare_driver)
         if not driver:
             print("Failed to initialize driver")
             return None
+        attach_tracer(driver)
         
         print("Twitter opened successfully")
-        time.sleep(5)  
+        enable_idle_waits(driver)
+        wait_for_idle(driver, timeout=5)  
         
         like_post(driver)
-        time.sleep(2)
+        wait_for_idle(driver, timeout=2)
         comment_on_post(driver)
         
-        time.sleep(2)
+        wait_for_idle(driver, timeout=2)
         tap_post_button_twice(driver)
         
-        time.sleep(2)
+        wait_for_idle(driver, timeout=2)
         make_new_post(driver)
         
         return True
@@ -221,8 +222,7 @@ def open_twitter(device_id=None):
         return None
     finally:
         if driver:
-            driver.quit()
-            print("Session ended")
+            session_pool.release(device_id, APP_PACKAGE, driver)
 
 if __name__ == "__main__":
     
@@ -234,15 +234,10 @@ if __name__ == "__main__":
         
         
         if len(devices) > 1:
-            try:
-                device_index = int(input("Select device number (or press Enter for first device): ")) - 1
-                selected_device = devices[device_index]
-            except (ValueError, IndexError):
-                print("Invalid selection, using first device")
-                selected_device = devices[0]
+            run_preflight(devices, APP_PACKAGE, PERMISSIONS)
+            results = run_fleet(open_twitter, devices)
+            print_fleet_report(results)
         else:
-            selected_device = devices[0]
-            
-        open_twitter(selected_device)
+            open_twitter(devices[0])
     else:
         print("No devices found. Please connect an Android device and try again.")
\ No newline at end of file
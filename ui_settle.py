@@ -0,0 +1,28 @@
+import time
+
+# UiAutomator2 waits up to 10s for the app to go idle before every lookup by default,
+# which never happens on feeds with autoplaying video
+IDLE_TIMEOUT_MS = 1500
+
+def enable_idle_waits(driver, idle_timeout_ms=IDLE_TIMEOUT_MS):
+    """Have UiAutomator2 wait (at most idle_timeout_ms) for the UI thread to go idle before each command"""
+    try:
+        driver.update_settings({"waitForIdleTimeout": idle_timeout_ms})
+        driver._idle_timeout_ms = idle_timeout_ms
+        return True
+    except Exception as e:
+        print(f"Error updating idle wait settings: {e}")
+        driver._idle_timeout_ms = None
+        return False
+
+def wait_for_idle(driver, timeout=5):
+    """Let the screen settle before the next action
+
+    With idle waits enabled the server already holds every command until the UI thread is idle, and the
+    lookups that follow wait for their element, so there is nothing to do here. Without them this is
+    the plain timeout-long pause the scripts used before.
+    """
+    if getattr(driver, "_idle_timeout_ms", None):
+        return True
+    time.sleep(timeout)
+    return True
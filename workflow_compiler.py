@@ -0,0 +1,162 @@
+from appium.webdriver.errorhandler import ERROR_TO_EXC_MAPPING
+from selenium.common.exceptions import UnknownMethodException, WebDriverException
+from locator_optimizer import optimize_locator
+from server_wait import EXECUTE_DRIVER, IMPLICIT, SERVER_POLL_MS, SCRIPT_MARGIN_MS, server_wait_method
+import json
+
+# Step operations and whether each one needs an element
+OPERATIONS = {
+    "find": True,
+    "click": True,
+    "type": True,
+    "clear": True,
+    "text": True,
+    "wait": False
+}
+
+DEFAULT_TIMEOUT = 10
+
+PRELUDE = """
+const ELEMENT_KEY = "element-6066-11e4-a52e-4f735466cecf";
+const results = {{}};
+let step = -1;
+function elementId(element) {{
+    return element[ELEMENT_KEY] || element.ELEMENT;
+}}
+async function locate(using, value, timeoutMs, parent) {{
+    const deadline = Date.now() + timeoutMs;
+    while (true) {{
+        const found = parent
+            ? await driver.findElementsFromElement(elementId(parent), using, value)
+            : await driver.findElements(using, value);
+        if (found.length) {{
+            return found[0];
+        }}
+        if (Date.now() >= deadline) {{
+            return null;
+        }}
+        await driver.pause({poll_ms});
+    }}
+}}
+try {{
+"""
+
+EPILOGUE = """
+} catch (e) {
+    return {ok: false, step, error: e.name && e.name !== "Error" ? e.name : "unknown error", message: e.message, results};
+}
+return {ok: true, results};
+"""
+
+def js(value):
+    return json.dumps(value)
+
+def step_name(index, step):
+    return step.get("name") or f"step{index}"
+
+def validate_steps(steps):
+    """Check every step before compiling; raises ValueError on the first bad one"""
+    names = set()
+    for index, step in enumerate(steps):
+        op = step.get("op")
+        if op not in OPERATIONS:
+            raise ValueError(f"Step {index}: unknown op '{op}', expected one of {', '.join(OPERATIONS)}")
+        if OPERATIONS[op] and not step.get("locator") and not step.get("target"):
+            raise ValueError(f"Step {index}: '{op}' needs a locator or a target")
+        if op == "wait" and not step.get("locator") and "ms" not in step:
+            raise ValueError(f"Step {index}: 'wait' needs a locator or ms")
+        if op == "type" and "text" not in step:
+            raise ValueError(f"Step {index}: 'type' needs text")
+        for key in ("target", "within"):
+            if step.get(key) and step[key] not in names:
+                raise ValueError(f"Step {index}: {key} '{step[key]}' is not the name of an earlier step")
+        names.add(step_name(index, step))
+
+def compile_step(index, step):
+    """JavaScript for one step; the located element is kept in results under the step's name"""
+    op = step["op"]
+    name = js(step_name(index, step))
+    lines = [f"    step = {index};"]
+    if op == "wait" and not step.get("locator"):
+        lines.append(f"    await driver.pause({int(step['ms'])});")
+        return "\n".join(lines)
+
+    if step.get("target"):
+        lines.append(f"    results[{name}] = results[{js(step['target'])}];")
+    else:
+        by, value = optimize_locator(*step["locator"], from_element=bool(step.get("within")))
+        timeout_ms = int(step.get("timeout", DEFAULT_TIMEOUT) * 1000)
+        parent = f"results[{js(step['within'])}]" if step.get("within") else "null"
+        lines.append(f"    results[{name}] = await locate({js(by)}, {js(value)}, {timeout_ms}, {parent});")
+
+    element = f"elementId(results[{name}])"
+    action = {
+        "click": f"await driver.elementClick({element});",
+        "type": f"await driver.elementSendKeys({element}, {js(step.get('text'))});",
+        "clear": f"await driver.elementClear({element});",
+        "text": f"results[{name}] = await driver.getElementText({element});"
+    }.get(op)
+
+    if step.get("optional"):
+        if action:
+            lines.append(f"    if (results[{name}]) {{")
+            lines.append(f"        {action}")
+            lines.append("    }")
+        return "\n".join(lines)
+
+    missing = js(f"No element for step {index} ({op}): {step.get('locator') or step.get('target')}")
+    lines.append(f"    if (!results[{name}]) {{")
+    lines.append(f"        return {{ok: false, step, error: \"no such element\", message: {missing}, results}};")
+    lines.append("    }")
+    if action:
+        lines.append(f"    {action}")
+    return "\n".join(lines)
+
+def compile_workflow(steps, poll_ms=SERVER_POLL_MS):
+    """Turn a list of step dicts into one WebdriverIO script for execute_driver
+
+    Each step is {"op": "find"|"click"|"type"|"clear"|"text"|"wait", ...} with either
+    "locator": (by, value) or "target": <name of an earlier step>, plus optional
+    "name", "within" (search inside an earlier step's element), "timeout" (seconds),
+    "optional" (skip the action when nothing matches), "text" for type and "ms" for a plain wait.
+    """
+    validate_steps(steps)
+    body = "\n".join(compile_step(index, step) for index, step in enumerate(steps))
+    return PRELUDE.format(poll_ms=poll_ms) + body + EPILOGUE
+
+def script_timeout_ms(steps):
+    """Upper bound for the whole script: every wait at its full timeout plus a margin"""
+    total = 0
+    for step in steps:
+        if step["op"] == "wait" and not step.get("locator"):
+            total += int(step["ms"])
+        elif not step.get("target"):
+            total += int(step.get("timeout", DEFAULT_TIMEOUT) * 1000)
+    return total + SCRIPT_MARGIN_MS
+
+def raise_step_error(steps, outcome):
+    """Raise the selenium exception matching the error the script reported"""
+    index = outcome.get("step", -1)
+    op = steps[index]["op"] if 0 <= index < len(steps) else "setup"
+    exception_class = ERROR_TO_EXC_MAPPING.get(outcome.get("error"), WebDriverException)
+    raise exception_class(f"Workflow step {index} ({op}) failed: {outcome.get('message')}")
+
+def run_workflow(driver, steps):
+    """Run the steps in one execute_driver round trip and return the results by step name
+
+    Returns None when the server won't run the script (no execute-driver plugin, the insecure feature
+    not enabled, ...), so callers can fall back to sending the steps one by one. Only failures the
+    script itself reports are raised.
+    """
+    if server_wait_method(driver) != EXECUTE_DRIVER:
+        return None
+    try:
+        outcome = driver.execute_driver(compile_workflow(steps), timeout_ms=script_timeout_ms(steps)).result
+    except WebDriverException as e:
+        if not isinstance(e, UnknownMethodException):
+            print(f"Can't run workflows with execute_driver, sending steps one by one instead: {e}")
+        driver._server_wait_method = IMPLICIT
+        return None
+    if not outcome or not outcome.get("ok"):
+        raise_step_error(steps, outcome or {})
+    return outcome["results"]
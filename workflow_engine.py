@@ -0,0 +1,318 @@
+from appium.webdriver.common.appiumby import AppiumBy
+from selenium.common.exceptions import WebDriverException
+from contextlib import contextmanager
+from command_batch import get_executor, enable_parallel_connections
+from server_wait import wait_on_server, implicit_wait
+from ui_settle import wait_for_idle
+import json
+import time
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Keys a locator can be written with in a workflow file, e.g. {"id": "com.twitter.android:id/inline_like"}
+LOCATOR_KEYS = {
+    "id": AppiumBy.ID,
+    "xpath": AppiumBy.XPATH,
+    "accessibility_id": AppiumBy.ACCESSIBILITY_ID,
+    "class_name": AppiumBy.CLASS_NAME,
+    "uiautomator": AppiumBy.ANDROID_UIAUTOMATOR
+}
+
+# Step actions and whether the screen stays put while they run, so the next step's
+# element can be looked up at the same time
+ACTIONS = {
+    "click": False,
+    "type": True,
+    "clear": True,
+    "none": True
+}
+
+DEFAULT_TIMEOUT = 10
+BRANCH_TIMEOUT = 2
+RETRY_DELAY = 0.5
+
+PHASES = ("locate", "act", "expect", "settle")
+
+class StepFailed(Exception):
+    """A step's element or expected result did not show up in time"""
+
+def parse_locator(spec):
+    """(by, value) for a locator written as {"id": ...}, {"xpath": ...}, etc. or as a (by, value) pair"""
+    if isinstance(spec, dict) and len(spec) == 1:
+        (key, value), = spec.items()
+        if key not in LOCATOR_KEYS:
+            raise ValueError(f"Unknown locator '{key}', expected one of {', '.join(LOCATOR_KEYS)}")
+        return LOCATOR_KEYS[key], value
+    if isinstance(spec, (list, tuple)) and len(spec) == 2:
+        return tuple(spec)
+    raise ValueError(f"Bad locator {spec!r}")
+
+def load_workflow(path):
+    """Read a workflow from a .yaml/.yml file (needs PyYAML) or a .json file"""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ImportError("PyYAML is needed for YAML workflows: pip install pyyaml")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+def workflow_steps(workflow):
+    """Name and step list of a workflow given as {"name": ..., "steps": [...]} or as a bare list"""
+    if isinstance(workflow, dict):
+        return workflow.get("name", "workflow"), workflow.get("steps", [])
+    return "workflow", workflow
+
+def plan_steps(steps, names=None, unlocated=None):
+    """Check the steps and work out which lookups can be prefetched; returns the planned steps
+
+    A step either locates an element and acts on it:
+        {"name", "locate": <locator>, "within": <earlier step>, "act": "click"|"type"|"clear"|"none" or a list,
+         "text", "repeat", "expect": <locator>, "timeout", "settle", "retry", "optional", "prefetch", "message"}
+    or branches on whether a locator shows up:
+        {"name", "if": <locator>, "timeout", "then": [steps], "else": [steps]}
+    A branch's element can only be searched in (with "within") by its own then steps.
+    """
+    names = set() if names is None else names
+    unlocated = set() if unlocated is None else unlocated
+    planned = []
+    for step in steps:
+        name = step.get("name") or f"step{len(names)}"
+        if name in names:
+            raise ValueError(f"Step '{name}': the name is already used by another step")
+        within = step.get("within")
+        if within and within not in names:
+            raise ValueError(f"Step '{name}': within '{within}' is not the name of an earlier step")
+        if within in unlocated:
+            raise ValueError(f"Step '{name}': within '{within}' is a branch; only its then steps can search in it")
+
+        if "if" in step:
+            names.add(name)
+            then = plan_steps(step.get("then", []), names, unlocated)
+            # Past the then steps the branch may not have found anything
+            unlocated.add(name)
+            planned.append({
+                "name": name,
+                "kind": "branch",
+                "locator": parse_locator(step["if"]),
+                "within": within,
+                "timeout": step.get("timeout", BRANCH_TIMEOUT),
+                "then": then,
+                "else": plan_steps(step.get("else", []), names, unlocated)
+            })
+            continue
+
+        if "locate" not in step:
+            raise ValueError(f"Step '{name}': needs 'locate' or 'if'")
+        actions = step.get("act", "none")
+        actions = [actions] if isinstance(actions, str) else list(actions)
+        for action in actions:
+            if action not in ACTIONS:
+                raise ValueError(f"Step '{name}': unknown action '{action}', expected one of {', '.join(ACTIONS)}")
+        if "type" in actions and "text" not in step:
+            raise ValueError(f"Step '{name}': 'type' needs text")
+
+        names.add(name)
+        planned.append({
+            "name": name,
+            "kind": "action",
+            "locator": parse_locator(step["locate"]),
+            "within": within,
+            "actions": actions,
+            "text": step.get("text"),
+            "repeat": int(step.get("repeat", 1)),
+            "expect": parse_locator(step["expect"]) if step.get("expect") else None,
+            "timeout": step.get("timeout", DEFAULT_TIMEOUT),
+            "settle": step.get("settle", 0),
+            "retry": int(step.get("retry", 0)),
+            "optional": bool(step.get("optional")),
+            "message": step.get("message"),
+            # Look up the next step's element while this one's actions run; by default only when they keep the screen
+            "prefetch": step.get("prefetch", all(ACTIONS[action] for action in actions))
+        })
+
+    for current, following in zip(planned, planned[1:]):
+        current["prefetch_next"] = (current["kind"] == "action" and following["kind"] == "action"
+                                    and bool(current["prefetch"]))
+    return planned
+
+def new_result(name):
+    result = {"step": name, "status": "ok", "attempts": 0, "prefetched": False, "branch": None, "error": None}
+    result.update((phase, 0.0) for phase in PHASES)
+    return result
+
+class WorkflowEngine:
+    """Runs planned workflow steps against a driver and times every step"""
+
+    def __init__(self, driver, executor=None):
+        # Prefetches share the session with the current step, so they need a connection of their own
+        self.driver = enable_parallel_connections(driver)
+        self.executor = executor or get_executor()
+        self.elements = {}
+        self.results = []
+
+    @contextmanager
+    def phase(self, result, name):
+        """Add the time spent inside the block to result[name] (milliseconds)"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            result[name] += (time.perf_counter() - started) * 1000
+
+    def run(self, workflow):
+        """Run a workflow and return its report: name, success, per-step results and duration"""
+        name, steps = workflow_steps(workflow)
+        planned = plan_steps(steps)
+        self.elements = {}
+        self.results = []
+        started = time.perf_counter()
+        success = self.run_steps(planned)
+        return {
+            "workflow": name,
+            "success": success,
+            "steps": self.results,
+            "duration": time.perf_counter() - started
+        }
+
+    def run_steps(self, planned):
+        """Run steps in order; returns False as soon as a required step fails"""
+        prefetched = None
+        for index, step in enumerate(planned):
+            if step["kind"] == "branch":
+                prefetched = None
+                if not self.run_branch(step):
+                    return False
+                continue
+            following = planned[index + 1] if step.get("prefetch_next") else None
+            result, prefetched = self.run_step(step, prefetched, following)
+            self.results.append(result)
+            if result["status"] == "failed":
+                return False
+        return True
+
+    def run_branch(self, step):
+        """Run the then or else steps depending on whether the branch's locator shows up"""
+        result = new_result(step["name"])
+        result["attempts"] = 1
+        with self.phase(result, "locate"):
+            try:
+                element = self.locate(step)
+            except (StepFailed, WebDriverException):
+                element = None
+        result["branch"] = "then" if element is not None else "else"
+        if element is not None:
+            self.elements[step["name"]] = element
+        self.results.append(result)
+        return self.run_steps(step[result["branch"]])
+
+    def run_step(self, step, prefetched, following):
+        """Locate, act and check one step, retrying as configured; returns its result and the next step's prefetch"""
+        result = new_result(step["name"])
+        next_lookup = None
+        for attempt in range(step["retry"] + 1):
+            result["attempts"] = attempt + 1
+            try:
+                with self.phase(result, "locate"):
+                    element = self.take_prefetched(prefetched) if attempt == 0 else None
+                    result["prefetched"] = element is not None
+                    if element is None:
+                        element = self.locate(step)
+                if element is None:
+                    raise StepFailed(f"Element not found: {step['locator'][1]}")
+                self.elements[step["name"]] = element
+
+                if following:
+                    next_lookup = self.prefetch(following)
+                for _ in range(step["repeat"]):
+                    with self.phase(result, "act"):
+                        for action in step["actions"]:
+                            self.perform(element, action, step["text"])
+                    if step["settle"]:
+                        with self.phase(result, "settle"):
+                            wait_for_idle(self.driver, timeout=step["settle"])
+
+                if step["expect"]:
+                    with self.phase(result, "expect"):
+                        if wait_on_server(self.driver, *step["expect"], step["timeout"]) is None:
+                            raise StepFailed(f"Expected element did not show up: {step['expect'][1]}")
+
+                if step["message"]:
+                    print(step["message"])
+                result["error"] = None
+                return result, next_lookup
+            except (StepFailed, WebDriverException) as e:
+                result["error"] = str(e).strip()
+                next_lookup = None
+                if attempt < step["retry"]:
+                    time.sleep(RETRY_DELAY)
+
+        result["status"] = "skipped" if step["optional"] else "failed"
+        if not step["optional"]:
+            print(f"Step '{step['name']}' failed: {result['error']}")
+        return result, None
+
+    def locate(self, step):
+        """Wait on the server for the step's element, inside its within element if it has one"""
+        by, value = step["locator"]
+        if not step["within"]:
+            return wait_on_server(self.driver, by, value, step["timeout"])
+        parent = self.elements.get(step["within"])
+        if parent is None:
+            raise StepFailed(f"Step '{step['within']}' has no element to search in")
+        with implicit_wait(self.driver, step["timeout"]):
+            found = parent.find_elements(by, value)
+        return found[0] if found else None
+
+    def prefetch(self, step):
+        """Start a no-wait lookup of step's element on a worker thread; None when it can't be done yet"""
+        search = self.elements.get(step["within"]) if step["within"] else self.driver
+        if search is None:
+            return None
+        return self.executor.submit(search.find_elements, *step["locator"])
+
+    def take_prefetched(self, lookup):
+        """First element a prefetch found, or None so the step waits for it normally"""
+        if lookup is None:
+            return None
+        try:
+            found = lookup.result()
+        except WebDriverException:
+            return None
+        return found[0] if found else None
+
+    def perform(self, element, action, text):
+        if action == "click":
+            element.click()
+        elif action == "type":
+            element.send_keys(text)
+        elif action == "clear":
+            element.clear()
+
+def execute_workflow(driver, workflow):
+    """Run a workflow dict/list (or the path of a workflow file) and return its report"""
+    if isinstance(workflow, str):
+        workflow = load_workflow(workflow)
+    return WorkflowEngine(driver).run(workflow)
+
+def print_workflow_report(report):
+    """Print the outcome and per-step timings of a workflow run"""
+    status = "OK" if report["success"] else "FAILED"
+    print(f"\nWorkflow '{report['workflow']}': {status} in {report['duration']:.2f}s")
+    for result in report["steps"]:
+        total = sum(result[phase] for phase in PHASES)
+        timings = ", ".join(f"{phase} {result[phase]:.0f}" for phase in PHASES if round(result[phase]))
+        line = f"  {result['step']}: {result['status']} {total:.0f}ms"
+        if timings:
+            line += f" ({timings})"
+        if result["prefetched"]:
+            line += " [prefetched]"
+        if result["branch"]:
+            line += f" -> {result['branch']}"
+        if result["attempts"] > 1:
+            line += f" after {result['attempts']} attempts"
+        if result["error"]:
+            line += f" - {result['error']}"
+        print(line)
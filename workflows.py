@@ -0,0 +1,108 @@
+from functools import partial
+from importlib import import_module
+from fleet_runner import run_fleet, print_fleet_report
+from session_pool import session_pool
+from ui_settle import enable_idle_waits
+from workflow_engine import execute_workflow, load_workflow, print_workflow_report
+import reddit_automation as reddit
+import twitter_automation as twitter
+import os
+import sys
+
+# Automation script behind each app, for its setup_driver and APP_PACKAGE
+APP_MODULES = {
+    "reddit": "reddit_automation",
+    "twitter": "twitter_automation"
+}
+
+def comment_not_by(users):
+    """Comment locator that skips comments written by any of users"""
+    authors = " or ".join(f"@text='{user}'" for user in users)
+    return f"{reddit.COMMENT}[{reddit.AUTHOR}[not({authors})]]"
+
+# find_and_upvote_post, comment_on_post and find_and_message_user from reddit_automation
+REDDIT_WORKFLOW = {
+    "name": "reddit",
+    "app": "reddit",
+    "steps": [
+        {"name": "post", "locate": {"xpath": reddit.POST_UNIT}},
+        {"name": "upvote", "within": "post", "locate": {"xpath": reddit.POST_BUTTONS["upvote"]}, "act": "click",
+         "prefetch": True, "message": "Upvoted the first post successfully"},
+        {"name": "comment_button", "within": "post", "locate": {"xpath": reddit.POST_BUTTONS["comment"]},
+         "act": "click", "retry": 1, "message": "Clicked the comment button on the first post"},
+        {"name": "join", "locate": {"xpath": reddit.JOIN_BUTTON}, "act": "click", "timeout": 5, "optional": True,
+         "message": "Clicked 'Join the conversation' button"},
+        {"name": "comment_input", "locate": {"xpath": reddit.COMMENT_INPUT}, "act": "type",
+         "text": reddit.COMMENT_TEXT, "message": "Typed a comment"},
+        {"name": "submit", "locate": {"xpath": reddit.SUBMIT_BUTTON}, "act": "click", "settle": 3,
+         "message": "Submitted the comment"},
+        {"name": "comment", "locate": {"xpath": comment_not_by(reddit.SKIP_USERS)}},
+        {"name": "author", "within": "comment", "locate": {"xpath": reddit.AUTHOR_TARGET}, "act": "click",
+         "message": "Clicked on username"},
+        {"name": "start_chat", "locate": {"xpath": reddit.START_CHAT}, "act": "click", "retry": 1,
+         "message": "Clicked Start Chat button"},
+        {"name": "message_input", "locate": {"xpath": reddit.MESSAGE_INPUT}, "act": ["click", "type"],
+         "text": reddit.MESSAGE_TEXT, "message": "Typed message"},
+        {"name": "send", "locate": {"xpath": reddit.SEND_BUTTON}, "act": "click", "message": "Clicked send button"}
+    ]
+}
+
+# like_post, comment_on_post, tap_post_button_twice and make_new_post from twitter_automation
+TWITTER_WORKFLOW = {
+    "name": "twitter",
+    "app": "twitter",
+    "steps": [
+        {"name": "like", "locate": {"id": twitter.LIKE_BUTTON}, "act": "click", "prefetch": True, "optional": True,
+         "message": "Post liked successfully"},
+        {"name": "reply", "locate": {"id": twitter.REPLY_BUTTON}, "act": "click", "message": "Clicked comment button"},
+        {"name": "reply_text", "locate": {"id": twitter.TWEET_TEXT}, "act": "type", "text": twitter.REPLY_TEXT,
+         "message": "Entered comment text"},
+        {"name": "send_reply", "locate": {"id": twitter.TWEET_BUTTON}, "act": "click", "message": "Posted comment"},
+        {"name": "compose", "locate": {"id": twitter.COMPOSE_BUTTON}, "act": "click", "repeat": 2, "settle": 2,
+         "message": "Tapped post button twice"},
+        {"name": "tweet_text", "locate": {"id": twitter.TWEET_TEXT}, "act": "type", "text": twitter.POST_TEXT,
+         "message": "Entered tweet text"},
+        {"name": "send_tweet", "locate": {"id": twitter.TWEET_BUTTON}, "act": "click",
+         "message": "Posted tweet successfully"}
+    ]
+}
+
+WORKFLOWS = {
+    "reddit": REDDIT_WORKFLOW,
+    "twitter": TWITTER_WORKFLOW
+}
+
+def run_on_app(workflow, device_id=None):
+    """Open a session for the workflow's app, run the workflow and print its timings"""
+    app = import_module(APP_MODULES[workflow["app"]])
+    driver = None
+    try:
+        driver = session_pool.acquire(device_id, app.APP_PACKAGE, app.setup_driver, app.prepare_driver)
+        if not driver:
+            print("Failed to initialize driver")
+            return None
+        enable_idle_waits(driver)
+        report = execute_workflow(driver, workflow)
+        print_workflow_report(report)
+        return report["success"]
+    except Exception as e:
+        print(f"Error running workflow: {e}")
+        return None
+    finally:
+        if driver:
+            session_pool.release(device_id, app.APP_PACKAGE, driver)
+
+if __name__ == "__main__":
+
+    # A reference workflow name or the path of a .yaml/.json workflow file, then optional device ids
+    name = sys.argv[1] if len(sys.argv) > 1 else "reddit"
+    if name not in WORKFLOWS and not os.path.exists(name):
+        print(f"Unknown workflow '{name}', choose from: {', '.join(WORKFLOWS)} or give a workflow file")
+        sys.exit(1)
+    workflow = WORKFLOWS.get(name) or load_workflow(name)
+    if workflow.get("app") not in APP_MODULES:
+        print(f"Unknown app '{workflow.get('app')}', use 'reddit' or 'twitter'")
+        sys.exit(1)
+
+    results = run_fleet(partial(run_on_app, workflow), sys.argv[2:] or None)
+    print_fleet_report(results)